@@ -1,14 +1,8 @@
 # Program 1: Caesar Cipher
+from classical import shift_table, translate
+
 def caesar_encrypt(text, shift):
-    result = ""
-    for char in text:
-        if char.isupper():
-            result += chr((ord(char) - 65 + shift) % 26 + 65)
-        elif char.islower():
-            result += chr((ord(char) - 97 + shift) % 26 + 97)
-        else:
-            result += char
-    return result
+    return translate(text, shift_table(shift))
 
 def caesar_decrypt(text, shift):
     return caesar_encrypt(text, -shift)
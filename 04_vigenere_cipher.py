@@ -1,38 +1,22 @@
 # Program 4: Vigenere (Polyalphabetic) Cipher
+from classical import vigenere_tables, vigenere_translate
+from vigenere_attack import crack_vigenere
+
 def vigenere_encrypt(plaintext, key):
-    plaintext = plaintext.upper()
-    key = key.upper()
-    result = ""
-    key_index = 0
-    
-    for char in plaintext:
-        if char.isalpha():
-            shift = ord(key[key_index % len(key)]) - 65
-            result += chr((ord(char) - 65 + shift) % 26 + 65)
-            key_index += 1
-        else:
-            result += char
-    return result
+    return vigenere_translate(plaintext.upper(), vigenere_tables(key))
 
 def vigenere_decrypt(ciphertext, key):
-    ciphertext = ciphertext.upper()
-    key = key.upper()
-    result = ""
-    key_index = 0
-    
-    for char in ciphertext:
-        if char.isalpha():
-            shift = ord(key[key_index % len(key)]) - 65
-            result += chr((ord(char) - 65 - shift) % 26 + 65)
-            key_index += 1
-        else:
-            result += char
-    return result
+    return vigenere_translate(ciphertext.upper(), vigenere_tables(key, -1))
 
 def main():
     print("=== Vigenere Cipher ===")
-    choice = input("'e' for encrypt, 'd' for decrypt: ").lower()
+    choice = input("'e' for encrypt, 'd' for decrypt, 'c' to crack: ").lower()
     text = input("Enter text: ")
+    if choice == 'c':
+        key, plaintext, _ = crack_vigenere(text)
+        print(f"Recovered key: {key}")
+        print(f"Decrypted: {plaintext}")
+        return
     key = input("Enter key: ")
     
     if choice == 'e':
@@ -1,37 +1,15 @@
 # Program 5: Affine Caesar Cipher
-def gcd(a, b):
-    while b:
-        a, b = b, a % b
-    return a
-
-def mod_inverse(a, m):
-    for i in range(1, m):
-        if (a * i) % m == 1:
-            return i
-    return None
+from classical import INVERSE_26, affine_decrypt_table, affine_table, translate
 
 def affine_encrypt(plaintext, a, b):
-    if gcd(a, 26) != 1:
+    if a % 26 not in INVERSE_26:
         return "Error: 'a' must be coprime with 26"
-    result = ""
-    for char in plaintext.upper():
-        if char.isalpha():
-            result += chr(((a * (ord(char) - 65) + b) % 26) + 65)
-        else:
-            result += char
-    return result
+    return translate(plaintext.upper(), affine_table(a, b))
 
 def affine_decrypt(ciphertext, a, b):
-    a_inv = mod_inverse(a, 26)
-    if not a_inv:
+    if a % 26 not in INVERSE_26:
         return "Error: No inverse"
-    result = ""
-    for char in ciphertext.upper():
-        if char.isalpha():
-            result += chr(((a_inv * (ord(char) - 65 - b)) % 26) + 65)
-        else:
-            result += char
-    return result
+    return translate(ciphertext.upper(), affine_decrypt_table(a, b))
 
 def main():
     print("=== Affine Cipher ===")
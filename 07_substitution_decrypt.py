@@ -1,10 +1,10 @@
 # Program 7: Simple Substitution Decryption
+from classical import text_to_nums
+from ngrams import fitness, letter_counts, letter_order
+
 def frequency_analysis(ciphertext):
-    freq = {}
-    for char in ciphertext.upper():
-        if char.isalpha():
-            freq[char] = freq.get(char, 0) + 1
-    return sorted(freq.items(), key=lambda x: x[1], reverse=True)
+    counts = letter_counts(text_to_nums(ciphertext))
+    return [(chr(65 + i), int(counts[i])) for i in counts.argsort(kind="stable")[::-1] if counts[i]]
 
 def main():
     print("=== Substitution Cipher Decryption ===")
@@ -15,21 +15,30 @@ def main():
     for char, count in freq[:10]:
         print(f"{char}: {count}")
     
+    # Starting guess: i-th most common cipher letter -> i-th most common
+    # letter of the language model's corpus
+    order = letter_order()
+    mapping = {c: p for (c, _), p in zip(freq, order)}
+    print(f"\nEnglish letters by frequency: {order}")
+    print("Starting mapping: " + " ".join(f"{c}->{p}" for c, p in list(mapping.items())[:10]))
+    
     print("\nHints:")
-    print("- Most common English letter: E")
     print("- Common word: THE")
     print("- Look for repeated patterns")
     
-    mapping = {}
     while True:
+        decrypted = ''.join(mapping.get(c, c) for c in ciphertext.upper())
+        nums = text_to_nums(decrypted)
+        score = fitness(nums) / max(1, len(nums) - 3)
+        print(f"\nCurrent: {decrypted}")
+        print(f"Quadgram fitness per letter: {score:.2f} (higher is more English-like)")
         cipher_char = input("\nCipher char (or 'done'): ").upper()
         if cipher_char == 'DONE':
             break
         plain_char = input("Maps to: ").upper()
         mapping[cipher_char] = plain_char
     
-    decrypted = ''.join(mapping.get(c, c) for c in ciphertext.upper())
     print(f"\nDecrypted: {decrypted}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,35 +1,28 @@
 # Program 9: Decrypt PT-109 Message
+from playfair import create_matrix, decrypt
+from playfair_attack import crack_playfair
+
 def playfair_decrypt(ciphertext, matrix):
-    def find_pos(char):
-        for i in range(5):
-            for j in range(5):
-                if matrix[i][j] == char:
-                    return i, j
-    
-    result = ""
-    for i in range(0, len(ciphertext), 2):
-        r1, c1 = find_pos(ciphertext[i])
-        r2, c2 = find_pos(ciphertext[i+1])
-        
-        if r1 == r2:
-            result += matrix[r1][(c1-1)%5] + matrix[r2][(c2-1)%5]
-        elif c1 == c2:
-            result += matrix[(r1-1)%5][c1] + matrix[(r2-1)%5][c2]
-        else:
-            result += matrix[r1][c2] + matrix[r2][c1]
-    
-    return result
+    return decrypt(ciphertext, matrix)
 
 def main():
     print("=== Decrypt PT-109 Message ===")
     cipher = "KXJEYUREBEZWEHEWRYTUHEYFSKREHEGOYFIWTTTUOLKSYCAJPOBOTEIZONTXBYBNTGONEYCUZWRGDSONSXBOUYWRHEBAAHYDSEDQ"
     cipher = cipher.replace(" ", "")
     
-    # Use appropriate Playfair matrix
-    key = input("Enter keyword for matrix: ").upper()
-    # Create matrix and decrypt
+    # Use appropriate Playfair matrix, or search for one by annealing
+    key = input("Enter keyword for matrix (blank to crack): ").upper()
     print(f"Ciphertext: {cipher}")
-    print("Decrypt using playfair matrix")
+    if key:
+        matrix = create_matrix(key)
+    else:
+        budget = float(input("Time budget in seconds (default 60): ") or "60")
+        matrix, _, score = crack_playfair(cipher, budget)
+        print(f"\nBest score: {score:.1f}")
+    print("\nPlayfair matrix:")
+    for i in range(0, 25, 5):
+        print(" ".join(matrix[i:i+5]))
+    print(f"\nDecrypted: {playfair_decrypt(cipher, matrix)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
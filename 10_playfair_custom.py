@@ -1,4 +1,7 @@
 # Program 10: Playfair with Custom Matrix
+from classical import nums_to_text, text_to_nums
+from playfair import apply_table, digraph_table
+
 def playfair_encrypt_custom():
     matrix = [
         ['M','F','H','I','K'],
@@ -8,28 +11,14 @@ def playfair_encrypt_custom():
         ['D','S','T','B','C']
     ]
     
-    def find_pos(char):
-        for i in range(5):
-            for j in range(5):
-                if matrix[i][j] == char:
-                    return i, j
-    
     plaintext = "MUSTSSEEYOUOVERCADOGANWESTCOMINGATONCE"
-    result = ""
     
-    for i in range(0, len(plaintext), 2):
-        r1, c1 = find_pos(plaintext[i])
-        r2, c2 = find_pos(plaintext[i+1])
-        
-        if r1 == r2:
-            result += matrix[r1][(c1+1)%5] + matrix[r2][(c2+1)%5]
-        elif c1 == c2:
-            result += matrix[(r1+1)%5][c1] + matrix[(r2+1)%5][c2]
-        else:
-            result += matrix[r1][c2] + matrix[r2][c1]
+    # Map every digraph through the precomputed table in one step
+    table = digraph_table(matrix)
+    result = nums_to_text(apply_table(table, text_to_nums(plaintext)))
     
     print(f"Plaintext: {plaintext}")
     print(f"Encrypted: {result}")
 
 if __name__ == "__main__":
-    playfair_encrypt_custom()
\ No newline at end of file
+    playfair_encrypt_custom()
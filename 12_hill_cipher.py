@@ -1,44 +1,29 @@
 # Program 12: Hill Cipher (2x2)
 import numpy as np
 
+from classical import nums_to_text, text_to_nums
+from hill import hill_apply, mat_inv_mod
+
 def hill_encrypt():
     plaintext = "meetmeattheusualplaceattenratherthaneightoclock"
     plaintext = plaintext.upper().replace(" ", "")
     
     key = np.array([[9, 4], [5, 7]])
     
-    # Convert to numbers
-    nums = [ord(c) - 65 for c in plaintext]
-    if len(nums) % 2:
-        nums.append(23)  # Pad with X
-    
-    # Encrypt
-    ciphertext_nums = []
-    for i in range(0, len(nums), 2):
-        vector = np.array([nums[i], nums[i+1]])
-        encrypted = np.dot(key, vector) % 26
-        ciphertext_nums.extend(encrypted)
-    
-    ciphertext = ''.join(chr(n + 65) for n in ciphertext_nums)
+    # Convert to numbers, pad with X and encrypt every block in one multiply
+    nums = text_to_nums(plaintext)
+    ciphertext_nums = hill_apply(key, nums)
+    ciphertext = nums_to_text(ciphertext_nums)
     
     print("Key matrix:")
     print(key)
     print(f"\nPlaintext: {plaintext}")
     print(f"Ciphertext: {ciphertext}")
     
-    # Decrypt
-    det = int(np.linalg.det(key)) % 26
-    det_inv = pow(det, -1, 26)
-    key_inv = (det_inv * np.round(det * np.linalg.inv(key)).astype(int)) % 26
-    
-    decrypted_nums = []
-    for i in range(0, len(ciphertext_nums), 2):
-        vector = np.array([ciphertext_nums[i], ciphertext_nums[i+1]])
-        decrypted = np.dot(key_inv, vector) % 26
-        decrypted_nums.extend(decrypted.astype(int))
-    
-    decrypted = ''.join(chr(n + 65) for n in decrypted_nums)
+    # Decrypt with the exact inverse mod 26
+    key_inv = mat_inv_mod(key)
+    decrypted = nums_to_text(hill_apply(key_inv, ciphertext_nums))
     print(f"Decrypted: {decrypted}")
 
 if __name__ == "__main__":
-    hill_encrypt()
\ No newline at end of file
+    hill_encrypt()
@@ -1,5 +1,5 @@
 # Program 13: Hill Cipher Known Plaintext Attack
-import numpy as np
+from hill_attack import known_plaintext_attack
 
 def hill_attack():
     print("=== Hill Cipher Known Plaintext Attack ===")
@@ -7,23 +7,23 @@ def hill_attack():
     print("\nC = K × P (mod 26)")
     print("K = C × P^(-1) (mod 26)")
     
-    plaintext = input("Enter plaintext pairs (e.g., 'HELP'): ").upper()
-    ciphertext = input("Enter ciphertext pairs: ").upper()
+    plaintext = input("Enter plaintext (e.g., 'HELP', at least n×n letters): ").upper()
+    ciphertext = input("Enter ciphertext: ").upper()
+    n = int(input("Key size n (default 2): ") or "2")
     
-    P = np.array([[ord(plaintext[0])-65, ord(plaintext[2])-65],
-                   [ord(plaintext[1])-65, ord(plaintext[3])-65]])
-    
-    C = np.array([[ord(ciphertext[0])-65, ord(ciphertext[2])-65],
-                   [ord(ciphertext[1])-65, ord(ciphertext[3])-65]])
-    
-    det_P = int(np.linalg.det(P)) % 26
-    det_inv = pow(det_P, -1, 26)
-    P_inv = (det_inv * np.round(det_P * np.linalg.inv(P)).astype(int)) % 26
-    
-    K = np.dot(C, P_inv) % 26
+    # Solved separately mod 2 and mod 13, so any n independent blocks of the
+    # crib will do for each prime, then joined by CRT
+    try:
+        K, pivots = known_plaintext_attack(plaintext, ciphertext, n)
+    except ValueError as err:
+        print(f"\nAttack failed: {err}")
+        return None
     
+    print(f"\nBlocks used: mod 2 {pivots[2]}, mod 13 {pivots[13]}")
     print(f"\nRecovered key matrix:")
     print(K.astype(int))
+    print("(verified against the whole crib)")
+    return K
 
 if __name__ == "__main__":
-    hill_attack()
\ No newline at end of file
+    hill_attack()
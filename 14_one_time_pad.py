@@ -1,4 +1,6 @@
 # Program 14: One-Time Pad
+from otp_attack import CribDragger, key_for, otp_text
+
 def one_time_pad():
     print("=== One-Time Pad ===")
     
@@ -6,10 +8,7 @@ def one_time_pad():
     plaintext = "sendmoremoney"
     key_stream = [9, 0, 1, 7, 23, 15, 21, 14, 11, 11, 2, 8, 9]
     
-    ciphertext = ""
-    for i in range(len(plaintext)):
-        encrypted = (ord(plaintext[i]) - 97 + key_stream[i]) % 26
-        ciphertext += chr(encrypted + 97)
+    ciphertext = otp_text(plaintext, key_stream)
     
     print(f"Plaintext: {plaintext}")
     print(f"Key stream: {key_stream}")
@@ -17,13 +16,30 @@ def one_time_pad():
     
     # Part b
     target = "cashnotneeded"
-    new_key = []
-    for i in range(len(target)):
-        key_val = (ord(ciphertext[i]) - ord(target[i])) % 26
-        new_key.append(key_val)
+    new_key = key_for(ciphertext, target)
     
     print(f"\nTo decrypt to '{target}':")
     print(f"New key stream: {new_key}")
+    
+    # Part c: the same key stream used twice is no longer a one-time pad
+    pad = key_stream + new_key + key_stream[::-1]
+    messages = ["meetthedirectoratnoonbythebridge", "wiretheransomtothedockaccountnow",
+                "theshipmentarrivesonthedockfrida"]
+    ciphertexts = [otp_text(m, pad) for m in messages]
+    print("\nThree messages under one key stream:")
+    for c in ciphertexts:
+        print(f"  {c}")
+    
+    dragger = CribDragger(ciphertexts)
+    crib = "thedock"
+    offset, score = dragger.drag(crib, source=1, top=1)[0]
+    print(f"\nDragging '{crib}' across message 2: best offset {offset} (score {score:.2f})")
+    for i, fragment in dragger.fragments(crib, offset, source=1).items():
+        print(f"  message {i + 1} reads '{fragment.lower()}' there")
+    dragger.accept(crib, offset, source=1)
+    print("\nRecovered so far:")
+    for text in dragger.plaintexts():
+        print(f"  {text.lower()}")
 
 if __name__ == "__main__":
-    one_time_pad()
\ No newline at end of file
+    one_time_pad()
@@ -1,24 +1,24 @@
 # Program 15: Frequency Attack on Additive Cipher
+from additive_attack import decrypt_shift, rank_shifts
+from classical import text_to_nums
+from ngrams import fitness
+
 def frequency_attack_additive():
     print("=== Frequency Attack on Additive Cipher ===")
     ciphertext = input("Enter ciphertext: ").upper()
     
-    results = []
-    for shift in range(26):
-        decrypted = ""
-        for char in ciphertext:
-            if char.isalpha():
-                decrypted += chr((ord(char) - 65 - shift) % 26 + 65)
-            else:
-                decrypted += char
-        results.append((shift, decrypted))
+    results = rank_shifts(ciphertext)
     
     num_results = int(input("How many top results? (default 10): ") or "10")
     
     print(f"\nTop {num_results} possible plaintexts:")
     for i in range(min(num_results, 26)):
-        print(f"\n{i+1}. Shift {results[i][0]}:")
-        print(results[i][1][:80])
+        shift, score = results[i]
+        plaintext = decrypt_shift(ciphertext, shift)
+        nums = text_to_nums(plaintext)
+        per_letter = fitness(nums) / max(1, len(nums) - 3)
+        print(f"\n{i+1}. Shift {shift} (chi-squared {score:.1f}, fitness {per_letter:.2f}):")
+        print(plaintext[:80])
 
 if __name__ == "__main__":
     frequency_attack_additive()
\ No newline at end of file
@@ -1,12 +1,23 @@
 # Program 17: DES Key Schedule for Decryption
-def des_key_schedule():
+from des import DES
+
+def des_key_schedule(key_hex="133457799BBCDFF1"):
     print("=== DES Key Generation for Decryption ===")
+    des = DES(bytes.fromhex(key_hex))
+    print(f"\nKey: {key_hex}")
     print("\nFor encryption:")
-    print("Keys used: K1, K2, K3, ..., K15, K16")
+    for i, k in enumerate(des.subkeys, 1):
+        print(f"K{i:<2} = {k:012X}")
     print("\nFor decryption:")
     print("Keys used: K16, K15, K14, ..., K2, K1 (reverse order)")
+    print(" ".join(f"{k:012X}" for k in des.inverse[:4]), "...")
     print("\nShift schedule remains same, applied in reverse")
     print("This maintains the Feistel structure property")
 
+    block = 0x0123456789ABCDEF
+    ciphertext = des.encrypt_block(block)
+    print(f"\nE(K, {block:016X}) = {ciphertext:016X}")
+    print(f"D(K, {ciphertext:016X}) = {des.decrypt_block(ciphertext):016X}")
+
 if __name__ == "__main__":
-    des_key_schedule()
\ No newline at end of file
+    des_key_schedule()
@@ -1,5 +1,7 @@
 # Program 18: DES Subkey Structure
-def des_subkey_structure():
+from des import PC2, key_schedule
+
+def des_subkey_structure(key_hex="133457799BBCDFF1"):
     print("=== DES Subkey Structure ===")
     print("\nInitial 56-bit key split into:")
     print("- C0: Left 28 bits")
@@ -10,5 +12,17 @@ def des_subkey_structure():
     print("\nPC-2 permutation selects 48 bits from 56-bit concatenation")
     print("The two halves come from disjoint subsets")
 
+    # Check the claim against the PC-2 table itself
+    from_c = all(pos <= 28 for pos in PC2[:24])
+    from_d = all(pos > 28 for pos in PC2[24:])
+    print(f"\nPC-2 first 24 entries all from C: {from_c}")
+    print(f"PC-2 last 24 entries all from D:  {from_d}")
+    print(f"C bits never used: {sorted(set(range(1, 29)) - set(PC2[:24]))}")
+    print(f"D bits never used: {sorted(set(range(29, 57)) - set(PC2[24:]))}")
+
+    print(f"\nSubkeys for key {key_hex} (C half | D half):")
+    for i, k in enumerate(key_schedule(bytes.fromhex(key_hex)), 1):
+        print(f"K{i:<2} = {k >> 24:06X} | {k & 0xFFFFFF:06X}")
+
 if __name__ == "__main__":
-    des_subkey_structure()
\ No newline at end of file
+    des_subkey_structure()
@@ -1,4 +1,9 @@
 # Program 19: CBC Mode with 3DES
+import os
+
+from cbc import cbc_decrypt, cbc_encrypt, key_setup_cost, timed
+from des import TripleDES
+
 def cbc_3des_comparison():
     print("=== CBC Mode with 3DES ===")
     print("\nOptions:")
@@ -12,10 +17,28 @@ def cbc_3des_comparison():
     print("   - Better performance, acceptable security")
     
     choice = input("\nChoose (a/b): ").lower()
+    k1, k2, k3 = os.urandom(8), os.urandom(8), os.urandom(8)
+    iv = os.urandom(8)
+    message = b"Attack at dawn! " * 4
+    cipher = TripleDES(k1, k2, k3) if choice == 'a' else TripleDES(k1, k2)
+    ciphertext = cbc_encrypt(cipher, message, iv)
+    print(f"\n{'EDE3' if choice == 'a' else 'EDE2'} CBC ciphertext: {ciphertext.hex()}")
+    print(f"Decrypted: {cbc_decrypt(cipher, ciphertext, iv).decode()}")
+    
+    # Measure the performance claim instead of assuming it
+    data = os.urandom(1 << 14)
+    print(f"\n{'Mode':<6} {'key setup us':>12} {'enc MB/s':>9} {'dec MB/s':>9}")
+    for name, core in (("EDE3", TripleDES(k1, k2, k3)), ("EDE2", TripleDES(k1, k2))):
+        setup, _ = key_setup_cost("3DES-" + name, trials=50)
+        enc, ciphertext = timed(cbc_encrypt, core, data, iv)
+        dec, _ = timed(cbc_decrypt, core, ciphertext, iv)
+        print(f"{name:<6} {setup:12.1f} {len(data) / enc / 1e6:9.3f} {len(data) / dec / 1e6:9.3f}")
+    print("\nBoth run three DES operations per block; EDE2 only saves one key schedule")
+    
     if choice == 'a':
         print("\nRecommendation: Use EDE3 mode for maximum security")
     else:
         print("\nRecommendation: Use EDE2 mode for better performance")
 
 if __name__ == "__main__":
-    cbc_3des_comparison()
\ No newline at end of file
+    cbc_3des_comparison()
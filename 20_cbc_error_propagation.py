@@ -1,24 +1,35 @@
 # Program 20: CBC Error Propagation
-def cbc_error_propagation():
+from errorsim import damage_profile, simulate
+
+def show_profile(label, errors, mask):
+    near, rest = damage_profile(errors, mask)
+    blocks = ", ".join(f"{label}{i + 1}: {v:.1f}" for i, v in enumerate(near))
+    print(f"  avg bit errors -> {blocks}, later blocks: {rest:.1f}")
+
+def cbc_error_propagation(trials=2000, blocks=64):
     print("=== CBC Mode Error Propagation ===")
+    print(f"(measured over {trials} random {blocks}-block messages)")
     
     print("\nPart a) Error in transmitted ciphertext C1:")
+    result = simulate("CBC", trials, blocks, positions=[5], seed=1)
+    show_profile("P", result["plain"], result["mask"])
     print("- P1 is completely corrupted (all bits affected)")
     print("- P2 has same bit error as C1 (1 bit affected)")
     print("- P3, P4, ... are NOT affected")
     print("Conclusion: Error affects only 2 blocks")
     
     print("\nPart b) Bit error in source plaintext P1:")
+    result = simulate("CBC", trials, blocks, positions=[5], target="plaintext", seed=1)
     print("At sender:")
-    print("- C1 is affected (1 bit error)")
-    print("- C2 is completely affected (avalanche effect)")
-    print("- C3, C4, ... are NOT affected")
+    show_profile("C", result["cipher"], result["mask"])
+    print("- C1 is completely affected (avalanche effect)")
+    print("- C2, C3, ... all change too, since each block chains on the last")
     
     print("\nAt receiver:")
-    print("- P1 recovered correctly (1 bit error)")
-    print("- P2 completely corrupted")
-    print("- P3 onwards are correct")
-    print("\nError propagates through 2 ciphertext blocks")
+    show_profile("P", result["plain"], result["mask"])
+    print("- P1 recovered with the same 1 bit error")
+    print("- P2 onwards are correct")
+    print("\nThe error reaches every later ciphertext block but only P1 at the receiver")
 
 if __name__ == "__main__":
-    cbc_error_propagation()
\ No newline at end of file
+    cbc_error_propagation()
@@ -1,4 +1,5 @@
 # Program 21: Padding Motivation in Block Ciphers
+from padding import pad, unpad
 def padding_motivation():
     print("=== Motivation for Padding ===")
     
@@ -21,6 +22,13 @@ def padding_motivation():
     
     print("\nPadding scheme: 1 bit followed by zero bits")
     print("Example: ...0001 or ...0100 or ...1000 or ...10000000")
+    
+    print("\nIf full blocks went unpadded, both would end in the block 41..47 80:")
+    for message in (b"ABCDEFG", b"ABCDEFG\x80"):
+        padded = pad(message, 8, "iso7816")
+        print(f"   {message!r:<16} -> {padded.hex(' ')}")
+        assert unpad(padded, 8, "iso7816") == message
+    print("   Always padding keeps them distinct and reversible")
 
 if __name__ == "__main__":
     padding_motivation()
\ No newline at end of file
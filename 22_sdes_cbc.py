@@ -1,4 +1,6 @@
 # Program 22: S-DES CBC Mode
+from sdes import cbc_decrypt, cbc_encrypt, to_bits, to_blocks, to_int
+
 def sdes_cbc():
     print("=== S-DES in CBC Mode ===")
     
@@ -14,11 +16,11 @@ def sdes_cbc():
     print("C1 = E(K, P1 ⊕ IV)")
     print("C2 = E(K, P2 ⊕ C1)")
     
-    print("\nExpected ciphertext: 11110100 00001011")
-    print("\nNote: Full S-DES implementation requires:")
-    print("- Initial and final permutations")
-    print("- Key generation")
-    print("- F function with S-boxes")
+    ciphertext = cbc_encrypt(to_blocks(plaintext), to_int(key), to_int(iv))
+    print(f"\nCiphertext: {to_bits(ciphertext)}")
+    print("Expected ciphertext: 11110100 00001011")
+    decrypted = cbc_decrypt(ciphertext, to_int(key), to_int(iv))
+    print(f"Decrypted: {to_bits(decrypted)}")
 
 if __name__ == "__main__":
-    sdes_cbc()
\ No newline at end of file
+    sdes_cbc()
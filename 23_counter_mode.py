@@ -1,4 +1,7 @@
 # Program 23: Counter Mode Encryption
+from ctr import xor_range
+from sdes import SDES, ctr, to_bits, to_blocks, to_int
+
 def counter_mode():
     print("=== Counter Mode Encryption ===")
     
@@ -15,12 +18,20 @@ def counter_mode():
     print("C2 = P2 ⊕ E(K, Counter+1)")
     print("C3 = P3 ⊕ E(K, Counter+2)")
     
-    print("\nExpected ciphertext: 00111000 01001111 00110010")
+    # All keystream blocks come from one table gather
+    ciphertext = ctr(to_blocks("".join(plaintext_blocks)), to_int(key), counter_start)
+    print(f"\nCiphertext: {to_bits(ciphertext)}")
+    print("Expected ciphertext: 00111000 01001111 00110010")
+    print(f"Decrypted: {to_bits(ctr(ciphertext, to_int(key), counter_start))}")
     
     print("\nAdvantages:")
     print("- Parallel encryption/decryption")
     print("- Random access to blocks")
     print("- No error propagation")
+    
+    # Random access: decrypt block 3 without touching blocks 1 and 2
+    block3 = xor_range(SDES(to_int(key)), counter_start, ciphertext[2:].tobytes(), 2)
+    print(f"\nBlock 3 decrypted on its own: {to_bits(block3)}")
 
 if __name__ == "__main__":
-    counter_mode()
\ No newline at end of file
+    counter_mode()
@@ -1,32 +1,41 @@
 # Program 24: RSA Private Key Calculation
-def rsa_private_key():
+import time
+
+from factoring import rsa_private_exponent
+from rsa import generate_key
+
+def rsa_private_key(e=31, n=3599):
     print("=== RSA Private Key Calculation ===")
-    e = 31
-    n = 3599
     
     print(f"Public key: e = {e}, n = {n}")
     
-    # Factor n using trial division
+    # Factor n: trial division, Fermat, p-1 or Pollard rho, whichever works first
     print("\nFactoring n...")
-    for p in range(2, int(n**0.5) + 1):
-        if n % p == 0:
-            q = n // p
-            print(f"Found: p = {p}, q = {q}")
-            
-            # Calculate phi(n)
-            phi_n = (p - 1) * (q - 1)
-            print(f"φ(n) = (p-1)(q-1) = {phi_n}")
-            
-            # Calculate d using extended Euclidean algorithm
-            d = pow(e, -1, phi_n)
-            print(f"\nPrivate key: d = {d}")
-            
-            # Verify
-            print(f"\nVerification: (e × d) mod φ(n) = {(e * d) % phi_n}")
-            return d
+    start = time.perf_counter()
+    try:
+        p, q, d, method = rsa_private_exponent(e, n)
+    except ValueError as err:
+        print(f"Could not recover d: {err}")
+        return None
+    elapsed = time.perf_counter() - start
+    print(f"Found: p = {p}, q = {q} ({method}, {elapsed:.3f} s)")
+    
+    # Calculate phi(n)
+    phi_n = (p - 1) * (q - 1)
+    print(f"φ(n) = (p-1)(q-1) = {phi_n}")
     
-    print("Could not factor n")
-    return None
+    # d = e^-1 mod phi(n) via the extended Euclidean algorithm
+    print(f"\nPrivate key: d = {d}")
+    
+    # Verify
+    print(f"\nVerification: (e × d) mod φ(n) = {(e * d) % phi_n}")
+    return d
 
 if __name__ == "__main__":
-    rsa_private_key()
\ No newline at end of file
+    rsa_private_key()
+    
+    # The same recovery on a generated 64-bit key, far beyond trial division
+    print()
+    key = generate_key(64)
+    d = rsa_private_key(key.e, key.n)
+    print(f"Matches the generated key: {d == key.d}")
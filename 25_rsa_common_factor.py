@@ -1,5 +1,9 @@
 # Program 25: RSA Common Factor Attack
 import math
+import os
+import tempfile
+
+from batchgcd import scan_file, weak_collection
 
 def rsa_common_factor_attack():
     print("=== RSA Common Factor Attack ===")
@@ -30,6 +34,22 @@ def rsa_common_factor_attack():
         other_factor = n // factor
         print(f"\nFactors found: {factor} and {other_factor}")
         print("RSA system is broken!")
+    
+    # The same idea at scale: many collected public keys, some of which
+    # reused a prime. One batch GCD finds every shared factor at once.
+    print("\nBatch scan of collected public keys:")
+    with tempfile.TemporaryDirectory() as tmp:
+        keys = os.path.join(tmp, "moduli.txt")
+        index = os.path.join(tmp, "weak.csv")
+        with open(keys, "w") as f:
+            f.write("\n".join(hex(n) for n in weak_collection(300, 256, shared=3)))
+        total, weak = scan_file(keys, index)
+        print(f"Scanned {total} moduli, {weak} share a prime with another key")
+        with open(index) as f:
+            next(f)
+            for line in f:
+                i, p, q, others = line.strip().split(",")
+                print(f"  n[{i}] = {p[:12]}... × {q[:12]}... (shares with n[{others}])")
 
 if __name__ == "__main__":
     rsa_common_factor_attack()
\ No newline at end of file
@@ -1,4 +1,8 @@
 # Program 26: RSA Key Reuse Security
+import math
+
+from rsa import RSAKey, factor_from_private, generate_key
+
 def rsa_key_reuse():
     print("=== RSA Key Reuse Analysis ===")
     
@@ -19,6 +23,21 @@ def rsa_key_reuse():
     print("   - Reusing n is bad practice")
     print("   - Multiple keys with same modulus can be attacked")
     
+    print("\nDemonstration (1024-bit key):")
+    old = generate_key(1024)
+    print(f"Leaked: e = {old.e}, d = {hex(old.d)[:20]}...")
+    p, q = factor_from_private(old.n, old.e, old.d)
+    print(f"Attacker factors n from (e, d): p = {hex(p)[:20]}..., q = {hex(q)[:20]}...")
+    e = 257
+    while math.gcd(e, old.phi) != 1:
+        e += 2
+    new = RSAKey(old.p, old.q, e)
+    message = 123456789
+    ciphertext = new.encrypt(message)
+    stolen = RSAKey(p, q, new.e)
+    print(f"New key on the same n: e = {new.e}")
+    print(f"Attacker decrypts a message sent to the new key: {stolen.decrypt(ciphertext)}")
+    
     print("\nCorrect approach:")
     print("- Generate completely new n (new p and q)")
     print("- Generate new e and d")
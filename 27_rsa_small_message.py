@@ -1,4 +1,10 @@
 # Program 27: RSA Small Message Attack
+import os
+import tempfile
+
+from rsa import generate_key
+from rsa_dictionary import compare_padding, decrypt_file, encrypt_text, load_table, write_ciphertexts
+
 def rsa_small_message_attack():
     print("=== RSA Small Message Attack ===")
     
@@ -24,6 +30,30 @@ def rsa_small_message_attack():
         ciphertext = pow(i, e, n)
         print(f"{char} ({i:2d}) → {ciphertext:4d}")
     
+    # Key size does not help: textbook RSA is still deterministic
+    key = generate_key(1024)
+    print(f"\nSame table for a generated {key.bits}-bit key (e={key.e}):")
+    for i in range(2, 5):
+        print(f"{chr(65 + i)} ({i:2d}) → {hex(key.encrypt(i))[:18]}...")
+    print("(A and B still encrypt to 0 and 1; each letter has exactly one ciphertext)")
+    
+    print("\nAttack on an intercepted file (one ciphertext per character):")
+    message = "MEETMEATTHETRAINSTATIONATNOON"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "intercepted.txt")
+        write_ciphertexts(path, encrypt_text(message, key.e, key.n))
+        # The table depends only on the public key: built once, then reused
+        for attempt in ("first", "second"):
+            table, cached = load_table(key.e, key.n, cache_dir=tmp)
+            print(f"Lookup table, {attempt} load: {len(table)} entries "
+                  f"({'read from cache' if cached else 'built and cached'})")
+        recovered, misses = decrypt_file(path, table)
+        print(f"Recovered: {recovered} ({misses} unknown)")
+        
+        print("\nSame message with OAEP padding:")
+        for scheme, (text, misses, _) in compare_padding(message, key, cache_dir=tmp).items():
+            print(f"{scheme:>8}: {text} ({misses} of {len(message)} not in table)")
+    
     print("\nSolution: Use padding (OAEP)")
     print("- Adds randomness")
     print("- Makes plaintext large")
@@ -1,4 +1,8 @@
 # Program 28: Diffie-Hellman Key Exchange
+import random
+
+from dh import FixedBase, generate_group, simulate
+
 def diffie_hellman():
     print("=== Diffie-Hellman Key Exchange ===")
     
@@ -28,6 +32,21 @@ def diffie_hellman():
     
     if shared_alice == shared_bob:
         print("✓ Key exchange successful!")
+    
+    # Same exchange at scale: a generated safe-prime group, g^x from a
+    # fixed-base table, and many independent pairs of parties
+    print("\n=== Simulation with generated groups ===")
+    rng = random.Random(28)
+    print(f"{'bits':>5} {'g':>3} {'exchanges':>10} {'pow /s':>9} {'fixed-base /s':>14}")
+    for bits in (128, 256, 512):
+        group = generate_group(bits, rng)
+        count = 200_000 // bits
+        ok_plain, t_plain = simulate(group, count, window=0, seed=bits)
+        ok_fixed, t_fixed = simulate(group, count, seed=bits)
+        print(f"{bits:5d} {group.g:3d} {ok_fixed:4d}/{count:<5d} {ok_plain / t_plain:9.0f} {ok_fixed / t_fixed:14.0f}")
+    table = FixedBase(group.g, group.p, group.q.bit_length())
+    print(f"Fixed-base table for the {group.bits}-bit group: "
+          f"{len(table.table)} rows x {len(table.table[0])} entries")
 
 if __name__ == "__main__":
     diffie_hellman()
\ No newline at end of file
@@ -1,4 +1,9 @@
 # Program 29: SHA-3 State Propagation
+import numpy as np
+
+from keccak import STEPS, capacity_report, random_blocks, trace_lanes
+
+RATE_LANES = 16
 def sha3_propagation():
     print("=== SHA-3 State Propagation ===")
     
@@ -24,8 +29,25 @@ def sha3_propagation():
     print("- χ (chi) step: nonlinear mixing")
     print("- ι (iota) step: adds round constant")
     
+    trials = 5000
+    trace = trace_lanes(random_blocks(trials, RATE_LANES), RATE_LANES, rounds=2)
+    mean, full = capacity_report(trace, RATE_LANES)
+    print(f"\nMeasured over {trials} random P0 blocks (every lane nonzero):")
+    print(f"{'round':<6}{'step':<7}{'nonzero capacity lanes':>24}{'all 9 nonzero':>15}")
+    for r in range(2):
+        for s, step in enumerate(STEPS):
+            print(f"{r + 1:<6}{step:<7}{mean[r, s]:24.2f}{full[r, s]:15.1%}")
+    
+    # Contrast: a P0 with a single bit set in lane 0
+    single = np.zeros((1, RATE_LANES), dtype=np.uint64)
+    single[0, 0] = 1
+    mean, _ = capacity_report(trace_lanes(single, RATE_LANES, rounds=2), RATE_LANES)
+    print(f"\nSingle-bit P0: {int(mean[0, -1])} capacity lanes nonzero after round 1, "
+          f"{int(mean[1, -1])} after round 2")
+    
     print("\nResult:")
     print("All capacity lanes have nonzero bits after 1 round")
+    print("(already after theta, which XORs column parities into every lane)")
     print("Full diffusion achieved quickly")
 
 if __name__ == "__main__":
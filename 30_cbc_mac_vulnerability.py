@@ -1,4 +1,9 @@
 # Program 30: CBC-MAC Vulnerability
+import os
+
+from des import DES
+from mac import cbc_mac, cmac, forge_extension
+
 def cbc_mac_vulnerability():
     print("=== CBC-MAC Vulnerability ===")
     
@@ -20,13 +25,22 @@ def cbc_mac_vulnerability():
     print("\nMAC of X || (X ⊕ T) is also T!")
     
     print("\nDemonstration:")
-    X = "MESSAGE1"
-    T = "MAC_TAG1"
-    forged_message = X + " || " + "(" + X + " ⊕ " + T + ")"
-    print(f"\nOriginal: {X}")
-    print(f"MAC: {T}")
-    print(f"Forged message: {forged_message}")
-    print(f"Forged MAC: {T} (same!)")
+    key = DES(os.urandom(8))
+    X = b"MESSAGE1"
+    T = cbc_mac(key, X)
+    forged_message = forge_extension(X, T)
+    print(f"\nOriginal: {X.hex()} ({X.decode()})")
+    print(f"MAC: {T.hex()}")
+    print(f"Forged message: {forged_message.hex()}")
+    print(f"Forged MAC: {cbc_mac(key, forged_message).hex()} "
+          f"({'same!' if cbc_mac(key, forged_message) == T else 'different'})")
+    
+    # The same trick against CMAC, using CMAC's own tag
+    T = cmac(key, X)
+    forged_message = forge_extension(X, T)
+    print(f"\nCMAC of X: {T.hex()}")
+    print(f"CMAC of X || (X ⊕ T): {cmac(key, forged_message).hex()} "
+          f"({'same!' if cmac(key, forged_message) == T else 'forgery fails'})")
     
     print("\nMitigation: Use CMAC instead")
 
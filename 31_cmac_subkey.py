@@ -1,4 +1,7 @@
 # Program 31: CMAC Subkey Generation
+from des import TripleDES
+from mac import cmac_subkeys, dbl
+
 def cmac_subkey_generation():
     print("=== CMAC Subkey Generation ===")
     
@@ -21,10 +24,20 @@ def cmac_subkey_generation():
     print("- XOR with Rb handles overflow")
     
     print("\nExample (128-bit):")
-    L = "0x2B7E151628AED2A6ABF7158809CF4F3C"
-    print(f"L = {L}")
-    print("K1 = L << 1 = (left shift)")
-    print("K2 = K1 << 1 = (left shift)")
+    L = 0x2B7E151628AED2A6ABF7158809CF4F3C
+    K1 = dbl(L, 128)
+    K2 = dbl(K1, 128)
+    print(f"L  = 0x{L:032X}")
+    print(f"K1 = 0x{K1:032X}  (MSB(L) = {L >> 127}: {'(L << 1) ⊕ Rb' if L >> 127 else 'L << 1'})")
+    print(f"K2 = 0x{K2:032X}  (MSB(K1) = {K1 >> 127}: {'(K1 << 1) ⊕ Rb' if K1 >> 127 else 'K1 << 1'})")
+    
+    print("\nExample (64-bit, 3DES key 8AA83BF8CBDA1062 0BC1BF19FBB6CD58 BC313D4A371CA8B5):")
+    core = TripleDES(*(bytes.fromhex(k) for k in ("8AA83BF8CBDA1062", "0BC1BF19FBB6CD58", "BC313D4A371CA8B5")))
+    L = core.encrypt_block(0)
+    K1, K2 = cmac_subkeys(core)
+    print(f"L  = E(K, 0^64) = 0x{L:016X}")
+    print(f"K1 = 0x{K1:016X}")
+    print(f"K2 = 0x{K2:016X}")
 
 if __name__ == "__main__":
     cmac_subkey_generation()
\ No newline at end of file
@@ -1,4 +1,5 @@
 # Program 33: DES Algorithm Implementation
+from des import DES, TEST_VECTORS
 def des_algorithm():
     print("=== Data Encryption Standard (DES) ===")
     
@@ -29,6 +30,13 @@ def des_algorithm():
     print("- 16 rounds of left shifts")
     print("- PC-2: 56 → 48 bits per round")
     
+    print("\nKnown-answer tests:")
+    for key, pt, ct in TEST_VECTORS:
+        des = DES(bytes.fromhex(key))
+        result = des.encrypt_block(int(pt, 16))
+        status = "OK" if result == int(ct, 16) else "FAIL"
+        print(f"K={key} P={pt} -> C={result:016X} {status}")
+
     print("\nNote: DES is now deprecated")
     print("Use AES or 3DES instead")
 
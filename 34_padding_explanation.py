@@ -1,4 +1,5 @@
 # Program 34: Padding in Block Ciphers
+from padding import pad, unpad
 def padding_explanation():
     print("=== Block Cipher Padding ===")
     
@@ -30,6 +31,18 @@ def padding_explanation():
     print("\nRemoving padding:")
     print("- Find last '1' bit")
     print("- Remove it and all following '0' bits")
+    
+    print("\nComputed (ISO/IEC 7816-4 and PKCS#7, 8-byte blocks):")
+    for message in (b"7 bytes", b"5byte", b"8 bytes!"):
+        for scheme in ("iso7816", "pkcs7"):
+            padded = pad(message, 8, scheme)
+            assert unpad(padded, 8, scheme) == message
+            print(f"   {message!r:<12} {scheme:<8} padding: {padded[len(message):].hex(' ')}")
+    
+    try:
+        unpad(b"5byte\x80\x01\x00", 8, "iso7816")
+    except ValueError as e:
+        print(f"\nCorrupted padding is rejected: {e}")
 
 if __name__ == "__main__":
     padding_explanation()
\ No newline at end of file
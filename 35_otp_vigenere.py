@@ -1,4 +1,6 @@
 # Program 35: One-Time Pad Vigenere
+from otp_attack import CribDragger, otp_text
+
 def otp_vigenere():
     print("=== One-Time Pad (Vigenere Variant) ===")
     
@@ -10,28 +12,29 @@ def otp_vigenere():
         print("Error: Key stream too short!")
         return
     
-    ciphertext = ""
-    for i in range(len(plaintext)):
-        if plaintext[i].isalpha():
-            encrypted = (ord(plaintext[i]) - 97 + key_stream[i]) % 26
-            ciphertext += chr(encrypted + 97)
-        else:
-            ciphertext += plaintext[i]
+    ciphertext = otp_text(plaintext, key_stream)
     
     print(f"\nPlaintext:  {plaintext}")
     print(f"Key stream: {key_stream[:len(plaintext)]}")
     print(f"Ciphertext: {ciphertext}")
     
     print("\nDecryption:")
-    decrypted = ""
-    for i in range(len(ciphertext)):
-        if ciphertext[i].isalpha():
-            decrypted_char = (ord(ciphertext[i]) - 97 - key_stream[i]) % 26
-            decrypted += chr(decrypted_char + 97)
-        else:
-            decrypted += ciphertext[i]
+    decrypted = otp_text(ciphertext, key_stream, sign=-1)
     
     print(f"Decrypted:  {decrypted}")
+    
+    # Reusing the key stream: the difference of the two ciphertexts no
+    # longer depends on the key, and a guessed word in one message
+    # reveals the other at the same position
+    second = ("theenemyknowsthesystem" * (len(plaintext) // 22 + 1))[:len(plaintext)]
+    dragger = CribDragger([ciphertext, otp_text(second, key_stream)])
+    print(f"\nIf the same key stream also encrypts '{second}':")
+    print(f"c1 - c2 = p1 - p2 = {dragger.difference(0, 1).tolist()}")
+    crib = "the"
+    if len(plaintext) >= len(crib):
+        for offset, score in dragger.drag(crib, source=1, top=3):
+            print(f"  '{crib}' at {offset:3d} in message 2 -> message 1 reads "
+                  f"'{dragger.fragments(crib, offset, source=1)[0].lower()}' (score {score:.2f})")
 
 if __name__ == "__main__":
-    otp_vigenere()
\ No newline at end of file
+    otp_vigenere()
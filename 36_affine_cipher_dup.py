@@ -1,26 +1,12 @@
 # Program 36: Affine Cipher (Duplicate)
 # Same as Program 5
-def gcd(a, b):
-    while b:
-        a, b = b, a % b
-    return a
-
-def mod_inverse(a, m):
-    for i in range(1, m):
-        if (a * i) % m == 1:
-            return i
-    return None
+from affine_attack import rank_keys
+from classical import INVERSE_26, affine_table, translate
 
 def affine_encrypt(plaintext, a, b):
-    if gcd(a, 26) != 1:
+    if a % 26 not in INVERSE_26:
         return "Error: 'a' must be coprime with 26"
-    result = ""
-    for char in plaintext.upper():
-        if char.isalpha():
-            result += chr(((a * (ord(char) - 65) + b) % 26) + 65)
-        else:
-            result += char
-    return result
+    return translate(plaintext.upper(), affine_table(a, b))
 
 def main():
     print("=== Affine Caesar Cipher ===")
@@ -28,7 +14,13 @@ def main():
     text = input("Enter plaintext: ")
     a = int(input("Enter a: "))
     b = int(input("Enter b: "))
-    print(f"Encrypted: {affine_encrypt(text, a, b)}")
+    encrypted = affine_encrypt(text, a, b)
+    print(f"Encrypted: {encrypted}")
+    if a % 26 in INVERSE_26:
+        # How far down the ciphertext-only ranking the real key lands
+        key = (a % 26, b % 26)
+        ranked = [k for k, _ in rank_keys(encrypted)]
+        print(f"Key {key} ranks #{ranked.index(key) + 1} of {len(ranked)} by letter frequencies")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,6 +2,9 @@
 # Same as Program 13
 import numpy as np
 
+from hill import hill_encrypt_text
+from hill_attack import ciphertext_only_attack, known_plaintext_attack
+
 def hill_attack():
     print("=== Hill Cipher Known Plaintext Attack ===")
     print("Given sufficient plaintext-ciphertext pairs:")
@@ -14,6 +17,22 @@ def hill_attack():
     print("\nChosen plaintext attack is even easier:")
     print("Choose P = I (identity matrix)")
     print("Then C = K directly!")
+    
+    K = np.array([[6, 24, 1], [13, 16, 10], [20, 17, 15]])
+    plaintext = ("THEHILLCIPHERISALINEARCIPHERANDSOAFEWBLOCKSOFMATCHINGPLAINTEXT"
+                 "ANDCIPHERTEXTAREENOUGHTORECOVERTHEWHOLEKEYMATRIXWITHALGEBRA")
+    ciphertext = hill_encrypt_text(plaintext, K)
+    print(f"\nSecret 3×3 key:\n{K}")
+    print(f"Ciphertext: {ciphertext}")
+    
+    found, pivots = known_plaintext_attack(plaintext[:27], ciphertext[:27], 3)
+    print(f"\nKnown plaintext (first 27 letters), blocks mod 2 {pivots[2]}, mod 13 {pivots[13]}:")
+    print(found)
+    
+    found, recovered = ciphertext_only_attack(ciphertext, 3)
+    print("\nCiphertext only (row-by-row search, 26^3 rows instead of 26^9 keys):")
+    print(found)
+    print(f"Plaintext: {recovered}")
 
 if __name__ == "__main__":
     hill_attack()
\ No newline at end of file
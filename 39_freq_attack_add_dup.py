@@ -1,25 +1,25 @@
 # Program 39: Frequency Attack Additive (Duplicate)
 # Same as Program 15
+from additive_attack import decrypt_shift, rank_shifts
+from classical import text_to_nums
+from ngrams import fitness
+
 def frequency_attack_additive():
     print("=== Frequency Attack on Additive Cipher ===")
     ciphertext = input("Enter ciphertext: ").upper()
     
-    results = []
-    for shift in range(26):
-        decrypted = ""
-        for char in ciphertext:
-            if char.isalpha():
-                decrypted += chr((ord(char) - 65 - shift) % 26 + 65)
-            else:
-                decrypted += char
-        results.append((shift, decrypted))
+    results = rank_shifts(ciphertext)
     
     num = int(input("Top N results (default 10): ") or "10")
     
     print(f"\nTop {num} possibilities:")
     for i in range(min(num, 26)):
-        print(f"\n{i+1}. Shift {results[i][0]}:")
-        print(results[i][1][:70])
+        shift, score = results[i]
+        plaintext = decrypt_shift(ciphertext, shift)
+        nums = text_to_nums(plaintext)
+        per_letter = fitness(nums) / max(1, len(nums) - 3)
+        print(f"\n{i+1}. Shift {shift} (chi-squared {score:.1f}, fitness {per_letter:.2f}):")
+        print(plaintext[:70])
 
 if __name__ == "__main__":
     frequency_attack_additive()
\ No newline at end of file
@@ -1,30 +1,21 @@
 # Program 40: Frequency Attack Mono (Duplicate)
 # Same as Programs 16 and 37
+from mono_attack import decrypt, solve_mono
+from ngrams import letter_order
+
 def frequency_attack_mono():
     print("=== Frequency Attack on Monoalphabetic Cipher ===")
     ciphertext = input("Enter ciphertext: ").upper()
     
-    freq = {}
-    for char in ciphertext:
-        if char.isalpha():
-            freq[char] = freq.get(char, 0) + 1
-    
-    sorted_freq = sorted(freq.items(), key=lambda x: x[1], reverse=True)
-    english_freq = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
-    
-    mapping = {}
-    for i, (cipher_char, count) in enumerate(sorted_freq):
-        if i < len(english_freq):
-            mapping[cipher_char] = english_freq[i]
-    
-    decrypted = ''.join(mapping.get(c, c) for c in ciphertext)
+    key, score, _ = solve_mono(ciphertext)
+    decrypted = decrypt(ciphertext, key)
     
-    print(f"\nTop 10 frequency mappings:")
-    for i, (c, p) in enumerate(list(mapping.items())[:10]):
-        print(f"{c} → {p}")
+    print(f"\nTop 10 key mappings (cipher → plain):")
+    for plain in letter_order()[:10]:
+        print(f"{key[ord(plain) - 65]} → {plain}")
     
-    print(f"\nDecrypted text (top 1 result):")
+    print(f"\nDecrypted text (score {score:.1f}):")
     print(decrypted)
 
 if __name__ == "__main__":
-    frequency_attack_mono()
\ No newline at end of file
+    frequency_attack_mono()
@@ -0,0 +1,15 @@
+# Ranked brute force for the additive (Caesar) cipher (Programs 15, 39)
+# One histogram of the ciphertext is rotated through all 26 shifts and each
+# rotation is scored against English, so only the winners get decrypted.
+from classical import shift_table, text_to_nums, translate
+from ngrams import chi_squared_shifts, letter_counts
+
+
+def rank_shifts(ciphertext):
+    # [(shift, chi-squared), ...] best first; O(len + 26 * 26)
+    scores = chi_squared_shifts(letter_counts(text_to_nums(ciphertext)))
+    return sorted(((s, float(scores[s])) for s in range(26)), key=lambda x: x[1])
+
+
+def decrypt_shift(ciphertext, shift):
+    return translate(ciphertext, shift_table(-shift))
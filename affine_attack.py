@@ -0,0 +1,88 @@
+# Ciphertext-only solver for the affine cipher (Programs 5, 6, 36)
+# All 12 * 26 = 312 keys are scored from one letter histogram. Key (a, b)
+# maps plaintext x to a*x + b, so under that key the plaintext histogram is
+# the ciphertext histogram permuted by the map, and its English
+# log-likelihood is sum_x counts[a*x + b] * log f[x]. For all keys at once
+# that is one matrix product of the counts with a fixed 26 x 312 table of
+# permuted log-frequencies, for a single message or a whole batch.
+# Log-likelihood ranks short messages better than chi-squared, whose 1/f
+# weights let one stray Q or Z swamp the score. Only the top keys are
+# decrypted, and those few are re-ranked with quadgrams.
+import time
+
+import numpy as np
+
+from classical import AFFINE_A, affine_decrypt_table, affine_table, text_to_nums, translate
+from ngrams import CORPUS_PATH, ENGLISH_FREQ, letter_counts, quadgram_score, quadgrams
+
+KEYS = [(a, b) for a in AFFINE_A for b in range(26)]
+# LOG_WEIGHTS[y, k] = log f[x] where key k encrypts plaintext x to y
+LOG_WEIGHTS = np.empty((26, len(KEYS)))
+for _k, (_a, _b) in enumerate(KEYS):
+    LOG_WEIGHTS[(_a * np.arange(26) + _b) % 26, _k] = np.log(ENGLISH_FREQ)
+
+
+def log_likelihood_keys(counts):
+    # counts has shape (..., 26); returns log-likelihoods of shape (..., 312)
+    return np.asarray(counts, dtype=np.float64) @ LOG_WEIGHTS
+
+
+def rank_keys(ciphertext):
+    # [((a, b), log-likelihood), ...] best first
+    scores = log_likelihood_keys(letter_counts(text_to_nums(ciphertext)))
+    return [(KEYS[k], float(scores[k])) for k in np.argsort(-scores, kind="stable")]
+
+
+def decrypt_affine(ciphertext, a, b):
+    return translate(ciphertext, affine_decrypt_table(a, b))
+
+
+def solve(ciphertext, top=10):
+    # Decrypt the `top` histogram-ranked keys and order them by quadgram score;
+    # returns [((a, b), plaintext), ...] best first
+    table = quadgrams()
+    candidates = [(key, decrypt_affine(ciphertext, *key)) for key, _ in rank_keys(ciphertext)[:top]]
+    return sorted(candidates, key=lambda c: -quadgram_score(text_to_nums(c[1]), table))
+
+
+def solve_many(ciphertexts, top=5):
+    # Batch version: one (messages, 26) histogram matrix, one matrix product
+    # for every key of every message, then top-k decryption per message.
+    # Returns [((a, b), plaintext), ...], one best guess per message.
+    nums = [text_to_nums(c) for c in ciphertexts]
+    counts = np.zeros((len(nums), 26))
+    for i, x in enumerate(nums):
+        counts[i] = letter_counts(x)
+    best = np.argsort(-log_likelihood_keys(counts), axis=1, kind="stable")[:, :top]
+    table = quadgrams()
+    results = []
+    for text, keys in zip(ciphertexts, best):
+        candidates = [(KEYS[k], decrypt_affine(text, *KEYS[k])) for k in keys]
+        results.append(max(candidates, key=lambda c: quadgram_score(text_to_nums(c[1]), table)))
+    return results
+
+
+def benchmark(messages=5000, length=30, top=5, seed=1):
+    rng = np.random.default_rng(seed)
+    with open(CORPUS_PATH, "rb") as f:
+        letters = text_to_nums(f.read())
+    starts = rng.integers(0, len(letters) - length, messages)
+    plains = [bytes(letters[s:s + length] + 65).decode() for s in starts]
+    keys = [KEYS[k] for k in rng.integers(0, len(KEYS), messages)]
+    ciphers = [translate(p, affine_table(a, b)) for p, (a, b) in zip(plains, keys)]
+    quadgrams()
+    print(f"=== Affine solver ({messages} messages of {length} letters, top {top}) ===")
+    start = time.perf_counter()
+    results = solve_many(ciphers, top)
+    elapsed = time.perf_counter() - start
+    correct = sum(r[1] == p for r, p in zip(results, plains))
+    print(f"Ranked:      {messages / elapsed:8.0f} messages/s, {correct / messages:.1%} correct")
+    start = time.perf_counter()
+    for c in ciphers[:500]:
+        for a, b in KEYS:
+            decrypt_affine(c, a, b)
+    print(f"Brute force: {500 / (time.perf_counter() - start):8.0f} messages/s")
+
+
+if __name__ == "__main__":
+    benchmark()
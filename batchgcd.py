@@ -0,0 +1,160 @@
+# Batch GCD over a collection of RSA moduli (Program 25)
+# Bernstein's method: build a product tree of all moduli, push P = prod(n)
+# back down as a remainder tree (R mod n^2 at each node), and at each leaf
+# gcd(R / n, n) is the product of the primes n shares with any other
+# modulus. Cost is a few multiplications of the full product instead of
+# N^2 / 2 pairwise gcds. The leaves are split into contiguous chunks: each
+# worker process multiplies up its chunk, the parent combines the chunk
+# roots, and each worker then walks its own remainder subtree.
+#
+# CPython's own big-int division is schoolbook, which makes the top of the
+# remainder tree quadratic; when gmpy2 is installed its mpz (FFT
+# multiplication, subquadratic division) is used and the whole scan becomes
+# quasi-linear.
+import math
+import multiprocessing
+import os
+import random
+import time
+
+from primes import random_prime
+
+try:
+    from gmpy2 import gcd, mpz
+except ImportError:
+    gcd, mpz = math.gcd, int
+
+
+def read_moduli(path):
+    # One modulus per line, decimal or 0x-prefixed hex; blank lines and
+    # lines starting with # are skipped
+    moduli = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                moduli.append(int(line, 0))
+    return moduli
+
+
+def product_tree(values):
+    tree = [[mpz(v) for v in values]]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append([level[i] * level[i + 1] if i + 1 < len(level) else level[i]
+                     for i in range(0, len(level), 2)])
+    return tree
+
+
+def remainders(tree, top):
+    # Walk top mod x^2 down the tree; returns the remainder at every leaf
+    rems = [top % (tree[-1][0] ** 2)]
+    for level in reversed(tree[:-1]):
+        rems = [rems[i // 2] % (x * x) for i, x in enumerate(level)]
+    return rems
+
+
+def leaf_gcds(moduli, top):
+    tree = product_tree(moduli)
+    return [int(gcd(r // n, n)) for r, n in zip(remainders(tree, top), tree[0])]
+
+
+def _chunk_product(chunk):
+    return int(product_tree(chunk)[-1][0])
+
+
+def _chunk_gcds(args):
+    chunk, top = args
+    return leaf_gcds(chunk, top)
+
+
+def batch_gcd(moduli, workers=1):
+    # g[i] = gcd(n_i, product of all other n_j)
+    if not moduli:
+        return []
+    if workers == 1:
+        return leaf_gcds(moduli, product_tree(moduli)[-1][0])
+    size = -(-len(moduli) // workers)
+    chunks = [moduli[i:i + size] for i in range(0, len(moduli), size)]
+    with multiprocessing.Pool(workers) as pool:
+        roots = pool.map(_chunk_product, chunks)
+        upper = product_tree(roots)
+        tops = remainders(upper, upper[-1][0])
+        parts = pool.map(_chunk_gcds, list(zip(chunks, tops)))
+    return [g for part in parts for g in part]
+
+
+def shared_factors(moduli, workers=1):
+    # {index: [(prime, [other indices sharing it])]} for every weak modulus.
+    # When g = n (both primes shared, or a duplicate modulus) the flagged
+    # moduli are split against each other pairwise, a small set in practice.
+    gcds = batch_gcd(moduli, workers)
+    weak = [i for i, g in enumerate(gcds) if g > 1]
+    primes = {}
+    for i in weak:
+        g, n = gcds[i], moduli[i]
+        if g == n:
+            parts = {math.gcd(n, moduli[j]) for j in weak if j != i} - {1}
+            proper = [p for p in parts if p != n]
+            factors = {p for p in proper for p in (p, n // p)} if proper else {n}
+        else:
+            factors = {g, n // g}
+        for p in factors:
+            primes.setdefault(p, set()).add(i)
+    index = {}
+    for p, members in primes.items():
+        if len(members) > 1:
+            for i in members:
+                index.setdefault(i, []).append((p, sorted(members - {i})))
+    return index
+
+
+def write_index(index, moduli, path):
+    # CSV: modulus index, shared prime, recovered cofactor, other indices
+    with open(path, "w") as f:
+        f.write("index,shared_prime,cofactor,shared_with\n")
+        for i in sorted(index):
+            for p, others in index[i]:
+                cofactor = moduli[i] // p
+                f.write(f"{i},{p},{cofactor},{' '.join(map(str, others))}\n")
+
+
+def scan_file(path, out_path, workers=None):
+    moduli = read_moduli(path)
+    index = shared_factors(moduli, workers or os.cpu_count())
+    write_index(index, moduli, out_path)
+    return len(moduli), len(index)
+
+
+def weak_collection(count, bits=512, shared=10, rng=None):
+    # Random moduli where `shared` pairs reuse a prime (as bad RNGs do)
+    rng = rng or random.Random()
+    primes = [random_prime(bits // 2, rng) for _ in range(2 * count - shared)]
+    moduli = [primes[2 * i] * primes[2 * i + 1] for i in range(count - shared)]
+    for k in range(shared):
+        moduli.append(primes[2 * k] * primes[2 * (count - shared) + k])
+    rng.shuffle(moduli)
+    return moduli
+
+
+def benchmark(sizes=(250, 500, 1000, 2000), bits=512, workers=None):
+    workers = workers or os.cpu_count()
+    print(f"=== Batch GCD benchmark ({bits}-bit moduli, {workers} worker(s)) ===")
+    print(f"{'moduli':>7} {'batch s':>8} {'pairwise s':>11} {'weak found':>11}")
+    rng = random.Random(1)
+    for count in sizes:
+        moduli = weak_collection(count, bits, shared=5, rng=rng)
+        start = time.perf_counter()
+        found = len(shared_factors(moduli, workers))
+        batch = time.perf_counter() - start
+        # Time a sample of pairwise gcds and scale to all N(N-1)/2 pairs
+        sample = 20_000
+        start = time.perf_counter()
+        for _ in range(sample):
+            math.gcd(moduli[rng.randrange(count)], moduli[rng.randrange(count)])
+        pairwise = (time.perf_counter() - start) / sample * count * (count - 1) / 2
+        print(f"{count:7d} {batch:8.2f} {pairwise:11.2f} {found:11d}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,154 @@
+# CBC mode over the DES cores, with a 3DES performance harness (Program 19)
+# Encryption is inherently sequential (each block needs the previous
+# ciphertext) and runs block by block on the scalar SP-box path. Decryption
+# is not: P_i = D(K, C_i) xor C_(i-1) only needs ciphertext, so every
+# D(K, C_i) of a range is done in one bit-sliced batch and ranges can be
+# spread over a process pool.
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from ctr import chunk_ranges
+from des import DES, TripleDES, clear_key_cache, ecb_decrypt_bitsliced
+from padding import Padder, Unpadder
+
+BLOCK = 8
+CHUNK_BYTES = 1 << 18
+# Below this many bytes the scalar path beats a bit-sliced batch
+BITSLICE_MIN = 64 * BLOCK
+
+
+def _check(data, iv):
+    if len(data) % BLOCK:
+        raise ValueError("Data must be a multiple of 8 bytes")
+    if len(iv) != BLOCK:
+        raise ValueError("IV must be 8 bytes")
+
+
+def cbc_encrypt(core, data, iv):
+    _check(data, iv)
+    out = bytearray(len(data))
+    prev = int.from_bytes(iv, "big")
+    for i in range(0, len(data), BLOCK):
+        prev = core.encrypt_block(int.from_bytes(data[i:i + BLOCK], "big") ^ prev)
+        out[i:i + BLOCK] = prev.to_bytes(BLOCK, "big")
+    return bytes(out)
+
+
+def decrypt_range(core, data, prev):
+    # data: whole ciphertext blocks; prev: the block before them (or the IV)
+    chain = np.frombuffer(prev + data[:-BLOCK], dtype=np.uint8)
+    if len(data) < BITSLICE_MIN:
+        plain = b"".join(core.decrypt_block(int.from_bytes(data[i:i + BLOCK], "big")).to_bytes(BLOCK, "big")
+                         for i in range(0, len(data), BLOCK))
+    else:
+        plain = ecb_decrypt_bitsliced(core, data)
+    return np.frombuffer(plain, dtype=np.uint8) ^ chain
+
+
+def _decrypt_worker(args):
+    core, data, prev, start = args
+    return start, decrypt_range(core, data, prev)
+
+
+def cbc_decrypt(core, data, iv, workers=1, chunk_bytes=CHUNK_BYTES):
+    _check(data, iv)
+    data = bytes(data)
+    out = bytearray(len(data))
+    target = memoryview(out)
+    jobs = [(core, data[a:b], iv if a == 0 else data[a - BLOCK:a], a)
+            for a, b in chunk_ranges(len(data), BLOCK, chunk_bytes)]
+    if workers == 1:
+        for start, chunk in map(_decrypt_worker, jobs):
+            target[start:start + len(chunk)] = chunk
+        return bytes(out)
+    with multiprocessing.Pool(workers) as pool:
+        for start, chunk in pool.imap_unordered(_decrypt_worker, jobs):
+            target[start:start + len(chunk)] = chunk
+    return bytes(out)
+
+
+def cbc_encrypt_stream(core, chunks, iv, scheme="pkcs7"):
+    # Pads and encrypts an iterable of chunks, yielding ciphertext as it goes;
+    # only the trailing partial block is ever held back
+    padder = Padder(BLOCK, scheme)
+    for chunk in chunks:
+        data = padder.update(chunk)
+        if data:
+            out = cbc_encrypt(core, data, iv)
+            iv = out[-BLOCK:]
+            yield out
+    yield cbc_encrypt(core, padder.finalize(), iv)
+
+
+def cbc_decrypt_stream(core, chunks, iv, scheme="pkcs7", workers=1):
+    unpadder = Unpadder(BLOCK, scheme)
+    rest = b""
+    for chunk in chunks:
+        data = rest + chunk
+        cut = len(data) - len(data) % BLOCK
+        data, rest = data[:cut], data[cut:]
+        if data:
+            out = unpadder.update(cbc_decrypt(core, data, iv, workers))
+            iv = data[-BLOCK:]
+            if out:
+                yield out
+    if rest:
+        raise ValueError("Data must be a multiple of 8 bytes")
+    yield unpadder.finalize()
+
+
+# --- Benchmark harness -----------------------------------------------------
+
+VARIANTS = {
+    "DES": lambda k1, k2, k3: DES(k1),
+    "3DES-EDE2": lambda k1, k2, k3: TripleDES(k1, k2),
+    "3DES-EDE3": lambda k1, k2, k3: TripleDES(k1, k2, k3),
+}
+
+
+def timed(fn, *args, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def key_setup_cost(variant, trials=200):
+    # Microseconds per cipher construction with fresh keys and with keys
+    # whose schedules are already cached
+    make = VARIANTS[variant]
+    keys = [tuple(os.urandom(8) for _ in range(3)) for _ in range(trials)]
+    clear_key_cache()
+    cold, _ = timed(lambda: [make(*k) for k in keys])
+    warm, _ = timed(lambda: [make(*k) for k in keys])
+    return cold / trials * 1e6, warm / trials * 1e6
+
+
+def benchmark(sizes=(1 << 10, 1 << 14, 1 << 17), workers=None):
+    workers = workers or os.cpu_count()
+    k1, k2, k3 = (bytes.fromhex(k) for k in ("0123456789ABCDEF", "23456789ABCDEF01", "456789ABCDEF0123"))
+    iv = bytes.fromhex("1234567890ABCDEF")
+    print(f"=== CBC benchmark ({workers} worker{'s' * (workers > 1)} for decryption) ===")
+    print(f"{'variant':<10} {'setup us':>9} {'cached us':>9}")
+    for name in VARIANTS:
+        cold, warm = key_setup_cost(name)
+        print(f"{name:<10} {cold:9.1f} {warm:9.1f}")
+
+    print(f"\n{'variant':<10} {'bytes':>8} {'enc MB/s':>9} {'us/block':>9} {'dec MB/s':>9} {'us/block':>9}")
+    for name, make in VARIANTS.items():
+        core = make(k1, k2, k3)
+        for size in sizes:
+            data = os.urandom(size)
+            enc, ciphertext = timed(cbc_encrypt, core, data, iv)
+            dec, plaintext = timed(cbc_decrypt, core, ciphertext, iv, workers)
+            assert plaintext == data
+            blocks = size // BLOCK
+            print(f"{name:<10} {size:8d} {size / enc / 1e6:9.3f} {enc / blocks * 1e6:9.1f}"
+                  f" {size / dec / 1e6:9.3f} {dec / blocks * 1e6:9.1f}")
+
+
+if __name__ == "__main__":
+    benchmark()
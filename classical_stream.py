@@ -0,0 +1,151 @@
+# Streaming mode for the classical ciphers (Programs 1, 2, 4, 5, 35)
+# Reads a file or stdin in fixed-size chunks so memory stays flat, carrying the
+# Vigenere key position and the one-time-pad key-stream offset across chunks.
+#
+#   python classical_stream.py caesar -e --shift 3 < in.txt > out.txt
+#   python classical_stream.py vigenere -d --key LEMON -i big.log -o plain.log
+#   python classical_stream.py otp -e --key-file pad.txt -i msg.txt
+import argparse
+import contextlib
+import string
+import sys
+
+import numpy as np
+
+from classical import (AFFINE_A, IS_LETTER, affine_table, mono_table, shift_table,
+                       translate_letters, vigenere_tables)
+
+CHUNK_SIZE = 1 << 20
+NON_LETTERS = bytes(i for i in range(256) if not IS_LETTER[i])
+
+
+def read_chunks(stream, chunk_size=CHUNK_SIZE):
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+class TableCipher:
+    # Caesar, affine and monoalphabetic: one table, no state between chunks
+    def __init__(self, table, upper=True):
+        self.table = table
+        self.upper = upper
+
+    def process(self, chunk):
+        if self.upper:
+            chunk = chunk.upper()
+        return chunk.translate(self.table)
+
+
+class VigenereCipher:
+    def __init__(self, key, sign):
+        self.tables = vigenere_tables(key, sign)
+        self.position = 0
+
+    def process(self, chunk):
+        chunk = chunk.upper()
+        out = translate_letters(chunk, self.tables, self.position)
+        self.position += len(chunk.translate(None, NON_LETTERS))
+        return out
+
+
+class KeyStream:
+    # Letters of the key file, A/a = 0 ... Z/z = 25; anything else is skipped
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        self.chunks = read_chunks(stream, chunk_size)
+        self.buffer = np.empty(0, dtype=np.uint8)
+
+    def take(self, n):
+        parts = [self.buffer[:n]]
+        have = len(parts[0])
+        self.buffer = self.buffer[n:]
+        while have < n:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                raise ValueError("Key stream too short!")
+            arr = np.frombuffer(chunk, dtype=np.uint8)
+            values = (arr[IS_LETTER[arr]] | 0x20) - 97
+            parts.append(values[:n - have])
+            self.buffer = values[n - have:]
+            have += len(parts[-1])
+        return np.concatenate(parts)
+
+
+class OneTimePad:
+    # Program 35: lower-case letters shifted by the next key-stream value
+    def __init__(self, key_stream, sign):
+        self.key_stream = key_stream
+        self.sign = sign
+
+    def process(self, chunk):
+        arr = np.frombuffer(chunk.lower(), dtype=np.uint8)
+        mask = IS_LETTER[arr]
+        out = arr.copy()
+        letters = arr[mask].astype(np.int16) - 97
+        keys = self.key_stream.take(len(letters)).astype(np.int16)
+        out[mask] = (letters + self.sign * keys) % 26 + 97
+        return out.tobytes()
+
+
+def build_cipher(args, key_file=None):
+    # key_file is the open one-time-pad key stream; raises ValueError on a bad key
+    sign = 1 if args.mode == "e" else -1
+    if args.cipher == "caesar":
+        return TableCipher(shift_table(sign * args.shift), upper=False)
+    if args.cipher == "affine":
+        a, b = args.a, args.b
+        if a % 26 not in AFFINE_A:
+            raise ValueError(f"Affine key a={a} has no inverse mod 26; use one of {AFFINE_A}")
+        if sign < 0:
+            a = pow(a, -1, 26)
+            b = -a * b
+        return TableCipher(affine_table(a, b))
+    if args.cipher == "mono":
+        if sorted(args.key.upper()) != list(string.ascii_uppercase):
+            raise ValueError("Monoalphabetic key must use each letter A-Z exactly once")
+        return TableCipher(mono_table(args.key, decrypt=sign < 0))
+    if args.cipher == "vigenere":
+        return VigenereCipher(args.key, sign)
+    return OneTimePad(KeyStream(key_file), sign)
+
+
+def run(cipher, src, dst, chunk_size=CHUNK_SIZE):
+    for chunk in read_chunks(src, chunk_size):
+        dst.write(cipher.process(chunk))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a file through a classical cipher")
+    parser.add_argument("cipher", choices=["caesar", "affine", "mono", "vigenere", "otp"])
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("-e", dest="mode", action="store_const", const="e", help="encrypt")
+    mode.add_argument("-d", dest="mode", action="store_const", const="d", help="decrypt")
+    parser.add_argument("--shift", type=int, default=3)
+    parser.add_argument("-a", type=int, default=1)
+    parser.add_argument("-b", type=int, default=0)
+    parser.add_argument("--key", default="")
+    parser.add_argument("--key-file", help="one-time-pad key stream (letters)")
+    parser.add_argument("-i", "--input", help="input file (default stdin)")
+    parser.add_argument("-o", "--output", help="output file (default stdout)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.cipher in ("vigenere", "mono") and not args.key:
+        parser.error("--key is required")
+    if args.cipher == "otp" and not args.key_file:
+        parser.error("--key-file is required")
+
+    with contextlib.ExitStack() as stack:
+        key_file = stack.enter_context(open(args.key_file, "rb")) if args.cipher == "otp" else None
+        try:
+            cipher = build_cipher(args, key_file)
+        except ValueError as e:
+            parser.error(str(e))
+        src = stack.enter_context(open(args.input, "rb")) if args.input else sys.stdin.buffer
+        dst = stack.enter_context(open(args.output, "wb")) if args.output else sys.stdout.buffer
+        run(cipher, src, dst, args.chunk_size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+# Shared engine: DES and 3DES (Programs 17, 18, 19, 33)
+# The scalar path works on 64-bit integers with precomputed byte tables for
+# IP/FP and the expansion E, and combined S-box + P lookups (SP boxes), so a
+# round is a handful of table lookups. The bit-sliced path transposes 64*W
+# blocks into 64 bit-planes of W uint64 words and runs every block of a
+# batch through the rounds at once with NumPy; permutations become plane
+# reordering and each S-box is a 6-level multiplexer tree over its truth table.
+import functools
+import time
+
+import numpy as np
+
+IP = [58, 50, 42, 34, 26, 18, 10, 2, 60, 52, 44, 36, 28, 20, 12, 4,
+      62, 54, 46, 38, 30, 22, 14, 6, 64, 56, 48, 40, 32, 24, 16, 8,
+      57, 49, 41, 33, 25, 17, 9, 1, 59, 51, 43, 35, 27, 19, 11, 3,
+      61, 53, 45, 37, 29, 21, 13, 5, 63, 55, 47, 39, 31, 23, 15, 7]
+FP = [40, 8, 48, 16, 56, 24, 64, 32, 39, 7, 47, 15, 55, 23, 63, 31,
+      38, 6, 46, 14, 54, 22, 62, 30, 37, 5, 45, 13, 53, 21, 61, 29,
+      36, 4, 44, 12, 52, 20, 60, 28, 35, 3, 43, 11, 51, 19, 59, 27,
+      34, 2, 42, 10, 50, 18, 58, 26, 33, 1, 41, 9, 49, 17, 57, 25]
+E = [32, 1, 2, 3, 4, 5, 4, 5, 6, 7, 8, 9, 8, 9, 10, 11,
+     12, 13, 12, 13, 14, 15, 16, 17, 16, 17, 18, 19, 20, 21, 20, 21,
+     22, 23, 24, 25, 24, 25, 26, 27, 28, 29, 28, 29, 30, 31, 32, 1]
+P = [16, 7, 20, 21, 29, 12, 28, 17, 1, 15, 23, 26, 5, 18, 31, 10,
+     2, 8, 24, 14, 32, 27, 3, 9, 19, 13, 30, 6, 22, 11, 4, 25]
+PC1 = [57, 49, 41, 33, 25, 17, 9, 1, 58, 50, 42, 34, 26, 18,
+       10, 2, 59, 51, 43, 35, 27, 19, 11, 3, 60, 52, 44, 36,
+       63, 55, 47, 39, 31, 23, 15, 7, 62, 54, 46, 38, 30, 22,
+       14, 6, 61, 53, 45, 37, 29, 21, 13, 5, 28, 20, 12, 4]
+PC2 = [14, 17, 11, 24, 1, 5, 3, 28, 15, 6, 21, 10,
+       23, 19, 12, 4, 26, 8, 16, 7, 27, 20, 13, 2,
+       41, 52, 31, 37, 47, 55, 30, 40, 51, 45, 33, 48,
+       44, 49, 39, 56, 34, 53, 46, 42, 50, 36, 29, 32]
+SHIFTS = [1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1]
+SBOXES = [
+    [[14, 4, 13, 1, 2, 15, 11, 8, 3, 10, 6, 12, 5, 9, 0, 7],
+     [0, 15, 7, 4, 14, 2, 13, 1, 10, 6, 12, 11, 9, 5, 3, 8],
+     [4, 1, 14, 8, 13, 6, 2, 11, 15, 12, 9, 7, 3, 10, 5, 0],
+     [15, 12, 8, 2, 4, 9, 1, 7, 5, 11, 3, 14, 10, 0, 6, 13]],
+    [[15, 1, 8, 14, 6, 11, 3, 4, 9, 7, 2, 13, 12, 0, 5, 10],
+     [3, 13, 4, 7, 15, 2, 8, 14, 12, 0, 1, 10, 6, 9, 11, 5],
+     [0, 14, 7, 11, 10, 4, 13, 1, 5, 8, 12, 6, 9, 3, 2, 15],
+     [13, 8, 10, 1, 3, 15, 4, 2, 11, 6, 7, 12, 0, 5, 14, 9]],
+    [[10, 0, 9, 14, 6, 3, 15, 5, 1, 13, 12, 7, 11, 4, 2, 8],
+     [13, 7, 0, 9, 3, 4, 6, 10, 2, 8, 5, 14, 12, 11, 15, 1],
+     [13, 6, 4, 9, 8, 15, 3, 0, 11, 1, 2, 12, 5, 10, 14, 7],
+     [1, 10, 13, 0, 6, 9, 8, 7, 4, 15, 14, 3, 11, 5, 2, 12]],
+    [[7, 13, 14, 3, 0, 6, 9, 10, 1, 2, 8, 5, 11, 12, 4, 15],
+     [13, 8, 11, 5, 6, 15, 0, 3, 4, 7, 2, 12, 1, 10, 14, 9],
+     [10, 6, 9, 0, 12, 11, 7, 13, 15, 1, 3, 14, 5, 2, 8, 4],
+     [3, 15, 0, 6, 10, 1, 13, 8, 9, 4, 5, 11, 12, 7, 2, 14]],
+    [[2, 12, 4, 1, 7, 10, 11, 6, 8, 5, 3, 15, 13, 0, 14, 9],
+     [14, 11, 2, 12, 4, 7, 13, 1, 5, 0, 15, 10, 3, 9, 8, 6],
+     [4, 2, 1, 11, 10, 13, 7, 8, 15, 9, 12, 5, 6, 3, 0, 14],
+     [11, 8, 12, 7, 1, 14, 2, 13, 6, 15, 0, 9, 10, 4, 5, 3]],
+    [[12, 1, 10, 15, 9, 2, 6, 8, 0, 13, 3, 4, 14, 7, 5, 11],
+     [10, 15, 4, 2, 7, 12, 9, 5, 6, 1, 13, 14, 0, 11, 3, 8],
+     [9, 14, 15, 5, 2, 8, 12, 3, 7, 0, 4, 10, 1, 13, 11, 6],
+     [4, 3, 2, 12, 9, 5, 15, 10, 11, 14, 1, 7, 6, 0, 8, 13]],
+    [[4, 11, 2, 14, 15, 0, 8, 13, 3, 12, 9, 7, 5, 10, 6, 1],
+     [13, 0, 11, 7, 4, 9, 1, 10, 14, 3, 5, 12, 2, 15, 8, 6],
+     [1, 4, 11, 13, 12, 3, 7, 14, 10, 15, 6, 8, 0, 5, 9, 2],
+     [6, 11, 13, 8, 1, 4, 10, 7, 9, 5, 0, 15, 14, 2, 3, 12]],
+    [[13, 2, 8, 4, 6, 15, 11, 1, 10, 9, 3, 14, 5, 0, 12, 7],
+     [1, 15, 13, 8, 10, 3, 7, 4, 12, 5, 6, 11, 0, 14, 9, 2],
+     [7, 11, 4, 1, 9, 12, 14, 2, 0, 6, 10, 13, 15, 3, 5, 8],
+     [2, 1, 14, 7, 4, 10, 8, 13, 15, 12, 9, 0, 3, 5, 6, 11]],
+]
+MASK64 = (1 << 64) - 1
+
+
+def permute(value, table, in_bits):
+    # Bits are numbered 1..in_bits from the most significant end
+    out = 0
+    for pos in table:
+        out = (out << 1) | ((value >> (in_bits - pos)) & 1)
+    return out
+
+
+def byte_tables(table, in_bits):
+    # tables[j][b] = permutation of byte value b placed at byte j of the input
+    n = in_bits // 8
+    return [[permute(b << (8 * (n - 1 - j)), table, in_bits) for b in range(256)]
+            for j in range(n)]
+
+
+def sbox_value(box, v):
+    # Outer bits (1 and 6) pick the row, inner four bits the column
+    return SBOXES[box][((v >> 4) & 2) | (v & 1)][(v >> 1) & 15]
+
+
+IP_BYTES = byte_tables(IP, 64)
+FP_BYTES = byte_tables(FP, 64)
+E_BYTES = byte_tables(E, 32)
+SP = [[permute(sbox_value(i, v) << (28 - 4 * i), P, 32) for v in range(64)]
+      for i in range(8)]
+
+
+def apply_bytes(tables, value, n):
+    out = 0
+    for j in range(n):
+        out |= tables[j][(value >> (8 * (n - 1 - j))) & 0xFF]
+    return out
+
+
+def key_schedule(key):
+    # 16 round subkeys (48-bit ints) from an 8-byte key or a 64-bit int.
+    # Schedules are cached, so reusing a key (or K1 = K3 in EDE2) is free.
+    if isinstance(key, (bytes, bytearray)):
+        key = int.from_bytes(key, "big")
+    return _key_schedule(key)
+
+
+@functools.lru_cache(maxsize=1024)
+def _key_schedule(key):
+    cd = permute(key, PC1, 64)
+    c, d = cd >> 28, cd & 0xFFFFFFF
+    subkeys = []
+    for shift in SHIFTS:
+        c = ((c << shift) | (c >> (28 - shift))) & 0xFFFFFFF
+        d = ((d << shift) | (d >> (28 - shift))) & 0xFFFFFFF
+        subkeys.append(permute((c << 28) | d, PC2, 56))
+    return tuple(subkeys)
+
+
+def clear_key_cache():
+    # Forget cached schedules, e.g. to time key setup from cold
+    _key_schedule.cache_clear()
+
+
+def crypt_block(block, subkeys):
+    # One 64-bit block through IP, 16 Feistel rounds and FP
+    sp0, sp1, sp2, sp3, sp4, sp5, sp6, sp7 = SP
+    e0, e1, e2, e3 = E_BYTES
+    block = apply_bytes(IP_BYTES, block, 8)
+    left, right = block >> 32, block & 0xFFFFFFFF
+    for k in subkeys:
+        x = (e0[right >> 24] | e1[(right >> 16) & 0xFF]
+             | e2[(right >> 8) & 0xFF] | e3[right & 0xFF]) ^ k
+        f = (sp0[x >> 42] | sp1[(x >> 36) & 63] | sp2[(x >> 30) & 63]
+             | sp3[(x >> 24) & 63] | sp4[(x >> 18) & 63] | sp5[(x >> 12) & 63]
+             | sp6[(x >> 6) & 63] | sp7[x & 63])
+        left, right = right, left ^ f
+    return apply_bytes(FP_BYTES, (right << 32) | left, 8)
+
+
+class DES:
+    block_size = 8
+
+    def __init__(self, key):
+        self.subkeys = key_schedule(key)
+        self.inverse = self.subkeys[::-1]
+
+    def encrypt_block(self, block):
+        return crypt_block(block, self.subkeys)
+
+    def decrypt_block(self, block):
+        return crypt_block(block, self.inverse)
+
+    def encrypt_ecb(self, data):
+        return ecb(self.encrypt_block, data)
+
+    def decrypt_ecb(self, data):
+        return ecb(self.decrypt_block, data)
+
+    def keystream(self, counter, blocks):
+        return ctr_keystream(self, counter, blocks)
+
+
+class TripleDES:
+    # EDE: E(K3, D(K2, E(K1, P))); two-key EDE2 uses K3 = K1
+    block_size = 8
+
+    def __init__(self, k1, k2, k3=None):
+        self.stages = [DES(k1), DES(k2), DES(k1 if k3 is None else k3)]
+
+    def encrypt_block(self, block):
+        a, b, c = self.stages
+        return c.encrypt_block(b.decrypt_block(a.encrypt_block(block)))
+
+    def decrypt_block(self, block):
+        a, b, c = self.stages
+        return a.decrypt_block(b.encrypt_block(c.decrypt_block(block)))
+
+    def encrypt_ecb(self, data):
+        return ecb(self.encrypt_block, data)
+
+    def decrypt_ecb(self, data):
+        return ecb(self.decrypt_block, data)
+
+    def keystream(self, counter, blocks):
+        return ctr_keystream(self, counter, blocks)
+
+
+def ecb(crypt, data):
+    if len(data) % 8:
+        raise ValueError("Data must be a multiple of 8 bytes")
+    out = bytearray(len(data))
+    for i in range(0, len(data), 8):
+        block = crypt(int.from_bytes(data[i:i + 8], "big"))
+        out[i:i + 8] = block.to_bytes(8, "big")
+    return bytes(out)
+
+
+# --- Bit-sliced batch path -------------------------------------------------
+
+ONES = np.uint64(MASK64)
+BITSLICE_CHUNK = 1 << 13  # blocks per batch; keeps the S-box trees in cache
+IP_INDEX = np.array(IP) - 1
+FP_INDEX = np.array(FP) - 1
+E_INDEX = np.array(E) - 1
+P_INDEX = np.array(P) - 1
+
+
+def _sbox_leaves():
+    # leaves[box, bit, a] = output bit `bit` (MSB first) of S-box `box` at
+    # address a = b1 b6 b2 b3 b4 b5, as an all-zeros or all-ones word
+    leaves = np.zeros((8, 4, 64), dtype=np.uint64)
+    for box in range(8):
+        for a in range(64):
+            row, col = a >> 4, a & 15
+            s = SBOXES[box][row][col]
+            for bit in range(4):
+                if (s >> (3 - bit)) & 1:
+                    leaves[box, bit, a] = ONES
+    return leaves[:, :, :, None]
+
+
+SBOX_LEAVES = _sbox_leaves()
+# Address bits from least to most significant: b5, b4, b3, b2, b6, b1
+MUX_ORDER = [4, 3, 2, 1, 5, 0]
+
+
+def to_planes(data):
+    # 64*W blocks (bytes) -> (64, W) uint64 bit-planes, plane j = DES bit j+1
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8).reshape(-1, 8), axis=1)
+    return np.packbits(np.ascontiguousarray(bits.T), axis=1).view(np.uint64)
+
+
+def from_planes(planes):
+    bits = np.unpackbits(np.ascontiguousarray(planes).view(np.uint8), axis=1)
+    return np.packbits(np.ascontiguousarray(bits.T), axis=1).tobytes()
+
+
+def key_masks(subkeys):
+    # (16, 48, 1) array of all-zeros/all-ones words, one per subkey bit
+    bits = [[(k >> (47 - i)) & 1 for i in range(48)] for k in subkeys]
+    return (np.array(bits, dtype=np.uint64) * ONES)[:, :, None]
+
+
+def sbox_planes(x):
+    # x: (8, 6, W) input planes of the eight S-boxes -> (32, W) output planes
+    node = SBOX_LEAVES
+    for b in MUX_ORDER:
+        sel = x[:, b][:, None, None, :]
+        lo, hi = node[:, :, 0::2], node[:, :, 1::2]
+        node = lo ^ ((lo ^ hi) & sel)
+    return node.reshape(32, -1)
+
+
+def crypt_planes(planes, masks):
+    block = planes[IP_INDEX]
+    left, right = block[:32], block[32:]
+    for k in masks:
+        x = (right[E_INDEX] ^ k).reshape(8, 6, -1)
+        left, right = right, left ^ sbox_planes(x)[P_INDEX]
+    return np.concatenate([right, left])[FP_INDEX]
+
+
+def crypt_bitsliced(data, stages):
+    # stages: list of subkey lists applied in order (one for DES, three for
+    # 3DES EDE with the middle list reversed). data length: multiple of 512.
+    masks = [key_masks(s) for s in stages]
+    out = bytearray(len(data))
+    step = BITSLICE_CHUNK * 8
+    for start in range(0, len(data), step):
+        planes = to_planes(data[start:start + step])
+        for m in masks:
+            planes = crypt_planes(planes, m)
+        out[start:start + step] = from_planes(planes)
+    return bytes(out)
+
+
+def bitsliced_stages(cipher, decrypt=False):
+    if isinstance(cipher, DES):
+        return [cipher.inverse if decrypt else cipher.subkeys]
+    a, b, c = cipher.stages
+    if decrypt:
+        return [c.inverse, b.subkeys, a.inverse]
+    return [a.subkeys, b.inverse, c.subkeys]
+
+
+def _pad_batch(data):
+    # The bit-sliced path works on whole groups of 64 blocks
+    if len(data) % 8:
+        raise ValueError("Data must be a multiple of 8 bytes")
+    extra = -len(data) % 512
+    return bytes(data) + bytes(extra), len(data)
+
+
+def ecb_encrypt_bitsliced(cipher, data):
+    padded, n = _pad_batch(data)
+    return crypt_bitsliced(padded, bitsliced_stages(cipher))[:n]
+
+
+def ecb_decrypt_bitsliced(cipher, data):
+    padded, n = _pad_batch(data)
+    return crypt_bitsliced(padded, bitsliced_stages(cipher, decrypt=True))[:n]
+
+
+def ctr_keystream(cipher, counter, blocks):
+    # E(K, counter + i mod 2^64) for i < blocks, as bytes
+    n = blocks + (-blocks % 64)
+    counters = np.uint64(counter % (1 << 64)) + np.arange(n, dtype=np.uint64)
+    stream = crypt_bitsliced(counters.astype(">u8").tobytes(), bitsliced_stages(cipher))
+    return stream[:blocks * 8]
+
+
+def ctr_bitsliced(cipher, data, counter=0):
+    # Works for any length; the last keystream block is truncated
+    stream = ctr_keystream(cipher, counter, -(-len(data) // 8))
+    data = np.frombuffer(data, dtype=np.uint8)
+    return (data ^ np.frombuffer(stream, dtype=np.uint8)[:len(data)]).tobytes()
+
+
+# --- Validation and benchmark ---------------------------------------------
+
+TEST_VECTORS = [
+    # key, plaintext, ciphertext
+    ("133457799BBCDFF1", "0123456789ABCDEF", "85E813540F0AB405"),
+    ("0101010101010101", "8000000000000000", "95F8A5E5DD31D900"),  # SP 800-17
+    ("0101010101010101", "0000000000000001", "166B40B44ABA4BD6"),
+    ("8001010101010101", "0000000000000000", "95A8D72813DAA94D"),
+    ("0123456789ABCDEF", "4E6F772069732074", "3FA40E8A984D4815"),  # FIPS 81
+    ("0123456789ABCDEF", "68652074696D6520", "6A271787AB8883F9"),
+    ("0123456789ABCDEF", "666F7220616C6C20", "893D51EC4B563B53"),
+]
+
+
+def self_test():
+    for key, pt, ct in TEST_VECTORS:
+        des = DES(bytes.fromhex(key))
+        assert des.encrypt_block(int(pt, 16)) == int(ct, 16), (key, pt)
+        assert des.decrypt_block(int(ct, 16)) == int(pt, 16), (key, ct)
+        data = bytes.fromhex(pt) * 64
+        assert ecb_encrypt_bitsliced(des, data) == bytes.fromhex(ct) * 64
+        assert ecb_decrypt_bitsliced(des, bytes.fromhex(ct) * 64) == data
+    k1, k2, k3 = (bytes.fromhex(k) for k in ("0123456789ABCDEF", "23456789ABCDEF01", "456789ABCDEF0123"))
+    tdes = TripleDES(k1, k2, k3)
+    data = bytes(range(256)) * 4
+    expected = tdes.encrypt_ecb(data)
+    assert ecb_encrypt_bitsliced(tdes, data) == expected
+    assert tdes.decrypt_ecb(expected) == data
+    assert TripleDES(k1, k1, k1).encrypt_ecb(data) == DES(k1).encrypt_ecb(data)
+    return True
+
+
+def benchmark(scalar_blocks=20_000, sliced_blocks=1 << 18):
+    des = DES(bytes.fromhex("133457799BBCDFF1"))
+    print("=== DES benchmark ===")
+    data = np.random.default_rng(1).bytes(scalar_blocks * 8)
+    start = time.perf_counter()
+    des.encrypt_ecb(data)
+    scalar = scalar_blocks / (time.perf_counter() - start)
+    print(f"Scalar SP-box ECB:   {scalar:12,.0f} blocks/s")
+
+    data = np.random.default_rng(2).bytes(sliced_blocks * 8)
+    start = time.perf_counter()
+    ecb_encrypt_bitsliced(des, data)
+    sliced = sliced_blocks / (time.perf_counter() - start)
+    print(f"Bit-sliced ECB:      {sliced:12,.0f} blocks/s ({sliced / scalar:.1f}x)")
+
+    start = time.perf_counter()
+    ctr_bitsliced(des, data, counter=1)
+    ctr = sliced_blocks / (time.perf_counter() - start)
+    print(f"Bit-sliced CTR:      {ctr:12,.0f} blocks/s")
+
+
+if __name__ == "__main__":
+    self_test()
+    print("FIPS test vectors: OK")
+    benchmark()
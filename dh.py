@@ -0,0 +1,172 @@
+# Diffie-Hellman groups and an exchange simulator (Program 28)
+# Groups are safe primes p = 2q + 1 with g generating the subgroup of prime
+# order q, so every public value other than 1 has order q. Candidates for q
+# are sieved so that neither q nor 2q + 1 has a small factor before any
+# Miller-Rabin test runs.
+#
+# Every party raises the same g, so g^x mod p uses a fixed-base table:
+# row i holds g^(j * 2^(w*i)) for j < 2^w, and g^x is the product of one
+# entry per w-bit digit of x. That is bits/w multiplications and no
+# squarings, against about bits squarings plus bits/5 multiplications for a
+# fresh pow(). Exchanges run in a process pool; each worker builds the table
+# once in its initializer.
+import multiprocessing
+import os
+import random
+import time
+
+from primes import SMALL_PRIMES, is_probable_prime
+
+WINDOW = 4
+
+
+class DHGroup:
+    def __init__(self, p, g, q=None):
+        self.p = p
+        self.q = q if q is not None else (p - 1) // 2
+        self.g = g
+
+    @property
+    def bits(self):
+        return self.p.bit_length()
+
+    def private_key(self, rng=None):
+        rng = rng or random.SystemRandom()
+        return rng.randrange(2, self.q)
+
+    def is_valid_public(self, y):
+        # In a safe-prime group 1 and p - 1 are the only elements of small
+        # order, so a range check is enough to rule out small-subgroup keys
+        return 1 < y < self.p - 1
+
+
+def random_safe_prime(bits, rng=None):
+    # p = 2q + 1 with both prime; q must avoid 0 and (r - 1) / 2 mod every
+    # small prime r, or r would divide q or 2q + 1
+    rng = rng or random.SystemRandom()
+    sieve = SMALL_PRIMES[1:]
+    while True:
+        q = rng.getrandbits(bits - 1) | (3 << (bits - 3)) | 1
+        if any(q % r in (0, r >> 1) for r in sieve):
+            continue
+        p = 2 * q + 1
+        # A base-2 Fermat test on p rejects most survivors cheaply
+        if pow(2, p - 1, p) == 1 and is_probable_prime(q, rng=rng) and is_probable_prime(p, rng=rng):
+            return p
+
+
+def subgroup_generator(p):
+    # Smallest g whose order is q = (p - 1) / 2: the quadratic residues
+    q = (p - 1) // 2
+    for g in range(2, p - 1):
+        if pow(g, q, p) == 1:
+            return g
+
+
+def generate_group(bits, rng=None):
+    p = random_safe_prime(bits, rng)
+    return DHGroup(p, subgroup_generator(p))
+
+
+class FixedBase:
+    def __init__(self, g, p, bits, window=WINDOW):
+        self.g, self.p, self.window = g, p, window
+        self.mask = (1 << window) - 1
+        table = []
+        base = g
+        for _ in range(-(-bits // window)):
+            row = [1]
+            for _ in range(self.mask):
+                row.append(row[-1] * base % p)
+            table.append(row)
+            base = row[-1] * base % p
+        self.table = table
+        self.top = base                 # g^(2^(w * rows)), for longer exponents
+
+    def pow(self, x):
+        p, mask, w = self.p, self.mask, self.window
+        r = 1
+        for row in self.table:
+            if not x:
+                break
+            d = x & mask
+            if d:
+                r = r * row[d] % p
+            x >>= w
+        else:
+            if x:
+                return pow(self.top, x, p) * r % p
+        return r
+
+
+def exchange(group, power, rng):
+    # One two-party exchange; returns the shared secret, or None if the two
+    # sides disagree or a public value fails validation
+    a, b = group.private_key(rng), group.private_key(rng)
+    A, B = power(a), power(b)
+    if not (group.is_valid_public(A) and group.is_valid_public(B)):
+        return None
+    shared_a, shared_b = pow(B, a, group.p), pow(A, b, group.p)
+    return shared_a if shared_a == shared_b else None
+
+
+_group = _power = None
+
+
+def _init_worker(p, g, q, window):
+    global _group, _power
+    _group = DHGroup(p, g, q)
+    _power = FixedBase(g, p, q.bit_length(), window).pow if window else (lambda x: pow(g, x, p))
+
+
+def _run_batch(args):
+    seed, count = args
+    rng = random.Random(seed)
+    return sum(exchange(_group, _power, rng) is not None for _ in range(count))
+
+
+def simulate(group, exchanges, workers=None, window=WINDOW, seed=None, batch=250):
+    # Runs `exchanges` independent key exchanges; window=0 uses plain pow().
+    # Returns (successful exchanges, seconds).
+    workers = workers or os.cpu_count()
+    seed = random.SystemRandom().getrandbits(64) if seed is None else seed
+    jobs = [(seed + i, min(batch, exchanges - start))
+            for i, start in enumerate(range(0, exchanges, batch))]
+    args = (group.p, group.g, group.q, window)
+    start = time.perf_counter()
+    if workers == 1:
+        _init_worker(*args)
+        done = sum(map(_run_batch, jobs))
+    else:
+        with multiprocessing.Pool(workers, _init_worker, args) as pool:
+            done = sum(pool.imap_unordered(_run_batch, jobs))
+    return done, time.perf_counter() - start
+
+
+def benchmark(sizes=(256, 512, 768, 1024), exchanges=2000, workers=None, seed=1):
+    rng = random.Random(seed)
+    workers = workers or os.cpu_count()
+    print(f"=== Diffie-Hellman exchanges/s ({workers} worker(s), window {WINDOW}) ===")
+    print(f"{'bits':>5} {'safe prime s':>13} {'pow /s':>9} {'fixed-base /s':>14} {'g^x speedup':>12}")
+    for bits in sizes:
+        start = time.perf_counter()
+        group = generate_group(bits, rng)
+        gen = time.perf_counter() - start
+        n = max(100, exchanges * 256 // bits)
+        plain_ok, plain = simulate(group, n, workers, window=0, seed=seed)
+        fixed_ok, fixed = simulate(group, n, workers, seed=seed)
+        assert plain_ok == fixed_ok == n
+        fb = FixedBase(group.g, group.p, group.q.bit_length())
+        xs = [group.private_key(rng) for _ in range(200)]
+        start = time.perf_counter()
+        slow = [pow(group.g, x, group.p) for x in xs]
+        t_pow = time.perf_counter() - start
+        start = time.perf_counter()
+        fast = [fb.pow(x) for x in xs]
+        t_fixed = time.perf_counter() - start
+        assert fast == slow
+        print(f"{bits:5d} {gen:13.2f} {n / plain:9.0f} {n / fixed:14.0f} {t_pow / t_fixed:11.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,187 @@
+# Integer factoring for the RSA attacks (Program 24)
+# Trial division only reaches tiny moduli. factor() tries, in order of cost:
+# small primes, Fermat's method (fast when p and q are close), Pollard's p-1
+# (fast when p-1 is smooth) and Pollard's rho with Brent's cycle finding and
+# batched gcds, which finds a factor p in about sqrt(p) steps whatever its
+# structure.
+import math
+import random
+import time
+
+from primes import SMALL_PRIMES, is_probable_prime, next_prime, random_prime
+
+FERMAT_STEPS = 100_000
+P1_BOUND = 100_000
+
+
+def trial_division(n, primes=SMALL_PRIMES):
+    for p in primes:
+        if n % p == 0 and n != p:
+            return p
+    return None
+
+
+def fermat(n, max_steps=FERMAT_STEPS):
+    # Search a = ceil(sqrt(n)), a + 1, ... for a^2 - n = b^2, so n = (a-b)(a+b)
+    if n % 2 == 0:
+        return 2
+    a = math.isqrt(n)
+    if a * a == n:
+        return a
+    a += 1
+    b2 = a * a - n
+    for _ in range(max_steps):
+        b = math.isqrt(b2)
+        if b * b == b2:
+            return a - b if a - b > 1 else None
+        b2 += 2 * a + 1
+        a += 1
+    return None
+
+
+def _primes_up_to(bound):
+    sieve = bytearray([1]) * (bound + 1)
+    sieve[:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(bound) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, bound + 1, i)))
+    return [i for i in range(bound + 1) if sieve[i]]
+
+
+def pollard_p_minus_1(n, bound=P1_BOUND):
+    # Stage 1: a = 2^M mod n with M the product of prime powers <= bound;
+    # p divides gcd(a - 1, n) when every prime power in p - 1 is <= bound
+    powers = []
+    for p in _primes_up_to(bound):
+        pk = p
+        while pk * p <= bound:
+            pk *= p
+        powers.append(pk)
+    a = 2
+    for pk in powers:
+        a = pow(a, pk, n)
+    g = math.gcd(a - 1, n)
+    if g == n:
+        # p - 1 and q - 1 were both smooth; redo with a gcd after each power
+        # to catch the point where only one of them is used up
+        a = 2
+        for pk in powers:
+            a = pow(a, pk, n)
+            g = math.gcd(a - 1, n)
+            if g > 1:
+                break
+    return g if 1 < g < n else None
+
+
+def pollard_rho(n, max_steps=None, rng=None):
+    # Brent's variant: power-of-two cycle search with the gcd taken once per
+    # batch of m products instead of every step
+    if n % 2 == 0:
+        return 2
+    rng = rng or random.Random()
+    m, steps = 128, 0
+    while max_steps is None or steps < max_steps:
+        y, c = rng.randrange(1, n), rng.randrange(1, n)
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            steps += r
+            r *= 2
+            if max_steps is not None and steps >= max_steps:
+                break
+        if g == n:
+            # The batch overshot; redo it one step at a time
+            while True:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+                if g > 1:
+                    break
+        if 1 < g < n:
+            return g
+    return None
+
+
+def factor(n):
+    # One nontrivial factor of a composite n, and the method that found it
+    if n < 4 or is_probable_prime(n):
+        raise ValueError(f"{n} is not composite")
+    for method, find in (("trial division", trial_division),
+                         ("Fermat", fermat),
+                         ("Pollard p-1", pollard_p_minus_1),
+                         ("Pollard rho (Brent)", pollard_rho)):
+        f = find(n)
+        if f:
+            return f, method
+
+
+def factorize(n):
+    # Sorted prime factors of n (with multiplicity)
+    if n < 2:
+        return []
+    if is_probable_prime(n):
+        return [n]
+    f, _ = factor(n)
+    return sorted(factorize(f) + factorize(n // f))
+
+
+def rsa_private_exponent(e, n):
+    # Recover (p, q, d, method) from a public key with n = p * q
+    p, method = factor(n)
+    q = n // p
+    phi = (p - 1) * (q - 1)
+    return min(p, q), max(p, q), pow(e, -1, phi), method
+
+
+def _smooth_prime(bits, bound, rng):
+    # A prime p with p - 1 = 2 * (distinct odd primes below `bound`)
+    primes = _primes_up_to(bound)[1:]
+    while True:
+        m = 2
+        for f in rng.sample(primes, len(primes)):
+            if m.bit_length() >= bits - 1:
+                break
+            m *= f
+        if is_probable_prime(m + 1) and (m + 1).bit_length() >= bits - 1:
+            return m + 1
+
+
+def _time(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def benchmark(sizes=(32, 48, 64, 80, 96, 128, 256, 512), rho_limit=1 << 19, seed=1):
+    # Seconds to split n = p * q by modulus size; "-" marks a method that
+    # gave up within its bound. Each method gets the kind of key it is
+    # built for (close primes for Fermat, smooth p - 1 for p-1) next to a
+    # random balanced key.
+    rng = random.Random(seed)
+    print("=== Factoring benchmark (seconds) ===")
+    print(f"{'bits':>5} {'rho random':>11} {'Fermat close':>13} {'Fermat random':>14}"
+          f" {'p-1 smooth':>11} {'p-1 random':>11}")
+    for bits in sizes:
+        p, q = random_prime(bits // 2, rng), random_prime(bits - bits // 2, rng)
+        n = p * q
+        close = next_prime(p + rng.randrange(2, 1 << max(2, bits // 8)))
+        smooth = _smooth_prime(bits // 2, 2000, rng) * q
+        cells = []
+        for fn, target in ((lambda m: pollard_rho(m, rho_limit), n), (fermat, p * close),
+                           (fermat, n), (pollard_p_minus_1, smooth), (pollard_p_minus_1, n)):
+            elapsed, found = _time(fn, target)
+            cells.append(f"{elapsed:.3f}" if found else "-")
+        print(f"{bits:5d} {cells[0]:>11} {cells[1]:>13} {cells[2]:>14} {cells[3]:>11} {cells[4]:>11}")
+
+
+if __name__ == "__main__":
+    benchmark()
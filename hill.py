@@ -0,0 +1,97 @@
+# Shared engine: n x n Hill cipher with exact modular inverse (Program 12)
+# The whole message is reshaped into blocks and encrypted with one matrix
+# multiply per chunk; the inverse key is computed by Gauss-Jordan over Z_26.
+import time
+
+import numpy as np
+
+from classical import nums_to_text, text_to_nums
+
+MOD = 26
+PAD = 23  # X
+CHUNK_BLOCKS = 1 << 16
+
+
+def mat_inv_mod(key, m=MOD):
+    # Gauss-Jordan on [K | I] with Euclidean row reduction, so it works for a
+    # composite modulus where a column may hold no unit (e.g. 2 and 13 mod 26)
+    key = [[int(x) % m for x in row] for row in np.asarray(key)]
+    n = len(key)
+    rows = [key[i] + [int(i == j) for j in range(n)] for i in range(n)]
+    for c in range(n):
+        for r in range(c + 1, n):
+            while rows[r][c]:
+                q = rows[c][c] // rows[r][c]
+                rows[c] = [(x - q * y) % m for x, y in zip(rows[c], rows[r])]
+                rows[c], rows[r] = rows[r], rows[c]
+        try:
+            inv = pow(rows[c][c], -1, m)
+        except ValueError:
+            raise ValueError("Key matrix is not invertible mod %d" % m) from None
+        rows[c] = [x * inv % m for x in rows[c]]
+        for r in range(n):
+            if r != c and rows[r][c]:
+                f = rows[r][c]
+                rows[r] = [(x - f * y) % m for x, y in zip(rows[r], rows[c])]
+    return np.array([row[n:] for row in rows], dtype=np.int64)
+
+
+def hill_apply(key, nums, chunk_blocks=CHUNK_BLOCKS):
+    # Blocks are the rows of B (shape N/n x n), so B @ K^T is K @ P for every
+    # column block P at once. float32 BLAS is exact while n * 25 * 25 < 2^24.
+    key = np.asarray(key)
+    n = key.shape[0]
+    nums = np.asarray(nums, dtype=np.uint8)
+    if len(nums) % n:
+        nums = np.concatenate([nums, np.full(n - len(nums) % n, PAD, dtype=np.uint8)])
+    blocks = nums.reshape(-1, n)
+    key_t = np.ascontiguousarray(key.T % MOD, dtype=np.float32)
+    out = np.empty_like(blocks)
+    for start in range(0, len(blocks), chunk_blocks):
+        prod = blocks[start:start + chunk_blocks].astype(np.float32) @ key_t
+        out[start:start + chunk_blocks] = prod.astype(np.int32) % MOD
+    return out.reshape(-1)
+
+
+def hill_encrypt_text(plaintext, key):
+    return nums_to_text(hill_apply(key, text_to_nums(plaintext)))
+
+
+def hill_decrypt_text(ciphertext, key):
+    return nums_to_text(hill_apply(mat_inv_mod(key), text_to_nums(ciphertext)))
+
+
+def benchmark(size=100_000_000, n=3):
+    rng = np.random.default_rng(1)
+    while True:
+        key = rng.integers(0, MOD, (n, n))
+        try:
+            key_inv = mat_inv_mod(key)
+            break
+        except ValueError:
+            pass
+    nums = rng.integers(0, MOD, size - size % n, dtype=np.uint8)
+
+    print(f"=== Hill engine benchmark ({size / 1e6:.0f} MB, {n}x{n} key) ===")
+    start = time.perf_counter()
+    raw = nums.reshape(-1, n).astype(np.float32) @ key.T.astype(np.float32)
+    raw_time = time.perf_counter() - start
+    del raw
+
+    start = time.perf_counter()
+    cipher = hill_apply(key, nums)
+    enc_time = time.perf_counter() - start
+    start = time.perf_counter()
+    plain = hill_apply(key_inv, cipher)
+    dec_time = time.perf_counter() - start
+    assert np.array_equal(plain, nums)
+
+    print(f"Raw float32 matmul: {size / raw_time / 1e6:8.1f} MB/s")
+    print(f"Hill encrypt:       {size / enc_time / 1e6:8.1f} MB/s "
+          f"({enc_time / raw_time:.1f}x raw)")
+    print(f"Hill decrypt:       {size / dec_time / 1e6:8.1f} MB/s "
+          f"({dec_time / raw_time:.1f}x raw)")
+
+
+if __name__ == "__main__":
+    benchmark()
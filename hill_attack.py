@@ -0,0 +1,176 @@
+# Known-plaintext and ciphertext-only attacks on the n x n Hill cipher
+# (Programs 13, 38)
+# Known plaintext: every crib block satisfies c = K p, so with the blocks
+# as rows C = P K^T. K^T is solved by Gauss-Jordan on [P | C] separately
+# over Z_2 and Z_13, which are fields, and the two results are joined by CRT.
+# Each prime picks its own n independent blocks out of the whole crib, so
+# the attack works even when no single n-block subset is invertible mod 26.
+# The leftover rows must reduce to zero, which checks the rest of the crib.
+#
+# Ciphertext only: plaintext position j of every block is row j of
+# D = K^-1 dotted with the cipher block, so each row can be searched on its
+# own: 26^n candidates per row instead of 26^(n^2) keys. All rows are
+# scored on letter frequencies in one matrix product; the best few are then
+# assigned to positions by maximizing bigram scores between neighbouring
+# positions, a small Viterbi over the block.
+import time
+
+import numpy as np
+
+from classical import nums_to_text, text_to_nums
+from hill import MOD, hill_apply, mat_inv_mod
+from ngrams import ENGLISH_FREQ, bigrams, corpus_nums, quadgram_score
+
+PRIMES = (2, 13)
+SEARCH_CHUNK = 1 << 12
+
+
+def solve_mod_prime(plain_blocks, cipher_blocks, p):
+    # Returns (K mod p, indices of the n crib blocks used as pivots)
+    n = plain_blocks.shape[1]
+    a = np.concatenate([plain_blocks, cipher_blocks], axis=1).astype(np.int64) % p
+    index = np.arange(len(a))
+    for col in range(n):
+        nonzero = np.flatnonzero(a[col:, col])
+        if not len(nonzero):
+            raise ValueError(f"Crib does not determine the key mod {p}")
+        pivot = col + nonzero[0]
+        a[[col, pivot]] = a[[pivot, col]]
+        index[[col, pivot]] = index[[pivot, col]]
+        a[col] = a[col] * pow(int(a[col, col]), -1, p) % p
+        factors = a[:, col].copy()
+        factors[col] = 0
+        a = (a - np.outer(factors, a[col])) % p
+    if a[n:, n:].any():
+        raise ValueError(f"Crib is not consistent with a {n}x{n} Hill key")
+    return a[:n, n:].T, sorted(index[:n].tolist())
+
+
+def crt_26(k2, k13):
+    # x = k2 mod 2 and x = k13 mod 13; 13 = 1 mod 2 and 14 = 1 mod 13
+    return (13 * k2 + 14 * k13) % MOD
+
+
+def known_plaintext_attack(plaintext, ciphertext, n):
+    # Recover the n x n key from a block-aligned crib of any length.
+    # Returns (key, {prime: pivot block indices}).
+    plain, cipher = text_to_nums(plaintext), text_to_nums(ciphertext)
+    blocks = min(len(plain), len(cipher)) // n
+    if blocks < n:
+        raise ValueError(f"Need at least {n * n} letters of crib for a {n}x{n} key")
+    p_blocks = plain[:blocks * n].reshape(-1, n)
+    c_blocks = cipher[:blocks * n].reshape(-1, n)
+    parts, pivots = [], {}
+    for p in PRIMES:
+        k, pivots[p] = solve_mod_prime(p_blocks, c_blocks, p)
+        parts.append(k)
+    key = crt_26(*parts)
+    mat_inv_mod(key)
+    if not np.array_equal(hill_apply(key, plain[:blocks * n]), cipher[:blocks * n]):
+        raise ValueError("Recovered key does not reproduce the crib")
+    return key, pivots
+
+
+def candidate_rows(n):
+    # All rows that are nonzero mod 2 and mod 13, as any row of an
+    # invertible matrix must be
+    rows = np.indices((MOD,) * n).reshape(n, -1).T
+    keep = (rows % 2).any(axis=1) & (rows % 13).any(axis=1)
+    return rows[keep]
+
+
+def rank_rows(cipher_blocks, top):
+    # The `top` rows d whose letter stream (C d) mod 26 is most English
+    rows = candidate_rows(cipher_blocks.shape[1])
+    log_freq = np.log(ENGLISH_FREQ)
+    scores = np.empty(len(rows))
+    c_t = cipher_blocks.T.astype(np.int64)
+    for start in range(0, len(rows), SEARCH_CHUNK):
+        letters = rows[start:start + SEARCH_CHUNK] @ c_t % MOD
+        scores[start:start + SEARCH_CHUNK] = log_freq[letters].sum(axis=1)
+    best = np.argsort(-scores, kind="stable")[:top]
+    return rows[best]
+
+
+def assign_rows(streams, n):
+    # streams[t] is the letter stream of candidate row t. Choose one row per
+    # block position maximizing the bigram score of every adjacent pair,
+    # including last position -> first position of the next block. Returns
+    # candidate index sequences, best first, one per starting row.
+    table = bigrams()
+    inner = table[streams[:, None, :], streams[None, :, :]].sum(axis=2)
+    wrap = table[streams[:, None, :-1], streams[None, :, 1:]].sum(axis=2)
+    t = len(streams)
+    score = inner.copy()                              # (start, current)
+    back = []
+    for _ in range(n - 2):
+        total = score[:, :, None] + inner[None, :, :]  # (start, prev, current)
+        back.append(total.argmax(axis=1))
+        score = total.max(axis=1)
+    score = score + wrap.T                            # wrap[last, start]
+    ends = score.argmax(axis=1)
+    order = np.argsort(-score[np.arange(t), ends], kind="stable")
+    chains = []
+    for s in order:
+        chain = [int(ends[s])]
+        for b in reversed(back):
+            chain.append(int(b[s, chain[-1]]))
+        chain.append(int(s))
+        chains.append(chain[::-1])
+    return chains
+
+
+def ciphertext_only_attack(ciphertext, n, top=None):
+    # Returns (key, plaintext) for the best invertible key found
+    cipher = text_to_nums(ciphertext)
+    cipher = cipher[:len(cipher) - len(cipher) % n]
+    blocks = cipher.reshape(-1, n)
+    rows = rank_rows(blocks, top or 24 * n)
+    streams = rows @ blocks.T.astype(np.int64) % MOD
+    best = None
+    for chain in assign_rows(streams, n)[:8]:
+        decrypt_key = rows[chain]
+        try:
+            key = mat_inv_mod(decrypt_key)
+        except ValueError:
+            continue
+        plain = streams[chain].T.reshape(-1)
+        score = quadgram_score(plain)
+        if best is None or score > best[0]:
+            best = (score, key, plain)
+    if best is None:
+        raise ValueError("No invertible key among the top candidates")
+    return best[1], nums_to_text(best[2])
+
+
+def _random_key(n, rng):
+    while True:
+        key = rng.integers(0, MOD, (n, n))
+        try:
+            mat_inv_mod(key)
+            return key
+        except ValueError:
+            pass
+
+
+def benchmark(sizes=(2, 3, 4), letters=300, seed=1):
+    rng = np.random.default_rng(seed)
+    corpus = corpus_nums()
+    print(f"=== Hill attacks ({letters}-letter messages) ===")
+    print(f"{'n':>2} {'known-plain ms':>15} {'cipher-only s':>14} {'rows searched':>14} {'keys in space':>14}")
+    for n in sizes:
+        key = _random_key(n, rng)
+        start = rng.integers(0, len(corpus) - letters)
+        plain = nums_to_text(corpus[start:start + letters - letters % n])
+        cipher = nums_to_text(hill_apply(key, text_to_nums(plain)))
+        t0 = time.perf_counter()
+        found, _ = known_plaintext_attack(plain[:4 * n * n], cipher[:4 * n * n], n)
+        t1 = time.perf_counter()
+        found_co, recovered = ciphertext_only_attack(cipher, n)
+        t2 = time.perf_counter()
+        assert np.array_equal(found, key) and np.array_equal(found_co, key) and recovered == plain
+        print(f"{n:2d} {(t1 - t0) * 1e3:15.2f} {t2 - t1:14.2f} {26 ** n:14d} {26.0 ** (n * n):14.2e}")
+
+
+if __name__ == "__main__":
+    benchmark()
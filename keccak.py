@@ -0,0 +1,255 @@
+# Keccak-f[1600], SHA-3 and a lane diffusion tracer (Program 29)
+# The state is a (..., 25) uint64 array of lanes, lane x + 5y holding A[x, y],
+# so a leading batch axis runs many independent states through the same
+# NumPy operations. Each step is a few whole-array operations: theta with
+# column parities, rho as per-lane rotations, pi as one gather, chi with two
+# shifted gathers and iota on lane 0. A single stream is hashed with the same
+# permutation on 25 Python ints instead, which avoids NumPy's per-call cost
+# on tiny arrays; sha3_many hashes many messages in lockstep on the batch path.
+import hashlib
+import os
+import time
+
+import numpy as np
+
+STEPS = ("theta", "rho", "pi", "chi", "iota")
+LANE = np.arange(25)
+X, Y = LANE % 5, LANE // 5
+
+
+def _round_constants():
+    # The rc(t) LFSR from the Keccak reference, x^8 + x^6 + x^5 + x^4 + 1
+    bits, r = [], 1
+    for _ in range(7 * 24):
+        bits.append(r & 1)
+        r <<= 1
+        if r & 0x100:
+            r ^= 0x171
+    out = []
+    for i in range(24):
+        rc = 0
+        for j in range(7):
+            rc |= bits[7 * i + j] << ((1 << j) - 1)
+        out.append(rc)
+    return np.array(out, dtype=np.uint64)
+
+
+def _rotation_offsets():
+    offsets = np.zeros(25, dtype=np.uint64)
+    x, y = 1, 0
+    for t in range(24):
+        offsets[x + 5 * y] = ((t + 1) * (t + 2) // 2) % 64
+        x, y = y, (2 * x + 3 * y) % 5
+    return offsets
+
+
+RC = _round_constants()
+RHO = _rotation_offsets()
+RHO_RIGHT = (np.uint64(64) - RHO) % np.uint64(64)
+# pi: B[y, 2x + 3y] = A[x, y], written as a gather for each destination lane
+PI_SRC = np.empty(25, dtype=np.intp)
+PI_SRC[Y + 5 * ((2 * X + 3 * Y) % 5)] = LANE
+COLUMN = X                      # theta: D[x] applies to every lane of column x
+CHI_1 = (X + 1) % 5 + 5 * Y
+CHI_2 = (X + 2) % 5 + 5 * Y
+ONE = np.uint64(1)
+SIXTY_THREE = np.uint64(63)
+
+# The same permutation on a list of 25 Python ints, for single streams where
+# per-call NumPy overhead on 25-lane arrays would dominate
+MASK64 = (1 << 64) - 1
+RC_INT = [int(rc) for rc in RC]
+RHO_PI = [(i, i % 5, int(RHO[i]), 64 - int(RHO[i]), int(np.flatnonzero(PI_SRC == i)[0]))
+          for i in range(25)]
+CHI = [(i, int(CHI_1[i]), int(CHI_2[i])) for i in range(25)]
+
+
+def _rotl1(v):
+    return (v << ONE) | (v >> SIXTY_THREE)
+
+
+def keccak_f(state, rounds=24, trace=None):
+    # Returns the permuted state; state has shape (..., 25). If trace is a
+    # list, the nonzero-lane mask after every step of every round is appended.
+    a = state
+    for rc in RC[:rounds]:
+        c = a[..., 0:5] ^ a[..., 5:10] ^ a[..., 10:15] ^ a[..., 15:20] ^ a[..., 20:25]
+        d = np.roll(c, 1, axis=-1) ^ _rotl1(np.roll(c, -1, axis=-1))
+        a = a ^ d[..., COLUMN]
+        if trace is not None:
+            trace.append(a != 0)
+        a = (a << RHO) | (a >> RHO_RIGHT)
+        if trace is not None:
+            trace.append(a != 0)
+        a = a[..., PI_SRC]
+        if trace is not None:
+            trace.append(a != 0)
+        a = a ^ (~a[..., CHI_1] & a[..., CHI_2])
+        if trace is not None:
+            trace.append(a != 0)
+        a[..., 0] ^= rc
+        if trace is not None:
+            trace.append(a != 0)
+    return a
+
+
+def keccak_f_lanes(a):
+    m = MASK64
+    for rc in RC_INT:
+        c0 = a[0] ^ a[5] ^ a[10] ^ a[15] ^ a[20]
+        c1 = a[1] ^ a[6] ^ a[11] ^ a[16] ^ a[21]
+        c2 = a[2] ^ a[7] ^ a[12] ^ a[17] ^ a[22]
+        c3 = a[3] ^ a[8] ^ a[13] ^ a[18] ^ a[23]
+        c4 = a[4] ^ a[9] ^ a[14] ^ a[19] ^ a[24]
+        d = (c4 ^ ((c1 << 1 | c1 >> 63) & m), c0 ^ ((c2 << 1 | c2 >> 63) & m),
+             c1 ^ ((c3 << 1 | c3 >> 63) & m), c2 ^ ((c4 << 1 | c4 >> 63) & m),
+             c3 ^ ((c0 << 1 | c0 >> 63) & m))
+        b = [0] * 25
+        for i, x, left, right, dst in RHO_PI:
+            v = a[i] ^ d[x]
+            b[dst] = (v << left | v >> right) & m
+        a = [b[i] ^ (~b[j] & b[k]) for i, j, k in CHI]
+        a[0] ^= rc
+    return a
+
+
+def _pad(data, rate):
+    # SHA-3 domain bits 01, then 10*1, up to a whole number of blocks
+    padded = bytearray(data) + bytes(rate - len(data) % rate)
+    padded[len(data)] ^= 0x06
+    padded[-1] ^= 0x80
+    return padded
+
+
+class SHA3:
+    # Streaming SHA3-224/256/384/512: update() absorbs whole rate blocks as
+    # they fill, keeping only the partial block. Runs on keccak_f_lanes.
+    def __init__(self, bits=256, data=b""):
+        if bits not in (224, 256, 384, 512):
+            raise ValueError("SHA-3 output size must be 224, 256, 384 or 512")
+        self.bits = bits
+        self.rate = 200 - bits // 4
+        self.state = [0] * 25
+        self.buffer = b""
+        self.update(data)
+
+    def update(self, data):
+        data = self.buffer + data if self.buffer else bytes(data)
+        rate = self.rate
+        end = len(data) - len(data) % rate
+        if end:
+            self.state = self._absorb(self.state, data[:end])
+        self.buffer = data[end:]
+        return self
+
+    def _absorb(self, state, data):
+        lanes = self.rate // 8
+        words = np.frombuffer(data, dtype="<u8").tolist()
+        for i in range(0, len(words), lanes):
+            for j, w in enumerate(words[i:i + lanes]):
+                state[j] ^= w
+            state = keccak_f_lanes(state)
+        return state
+
+    def digest(self):
+        state = self._absorb(list(self.state), _pad(self.buffer, self.rate))
+        return np.array(state, dtype="<u8").tobytes()[:self.bits // 8]
+
+    def hexdigest(self):
+        return self.digest().hex()
+
+
+def sha3_many(messages, bits=256):
+    # Hash many messages at once: all states advance together through the
+    # batched permutation, each absorbing only while it has blocks left
+    rate = SHA3(bits).rate
+    lanes = rate // 8
+    padded = [_pad(m, rate) for m in messages]
+    blocks = np.array([len(p) // rate for p in padded])
+    words = np.zeros((len(messages), blocks.max(initial=1), lanes), dtype=np.uint64)
+    for i, p in enumerate(padded):
+        words[i, :blocks[i]] = np.frombuffer(bytes(p), dtype="<u8").reshape(-1, lanes)
+    state = np.zeros((len(messages), 25), dtype=np.uint64)
+    for j in range(words.shape[1]):
+        active = blocks > j
+        if active.all():
+            state[:, :lanes] ^= words[:, j]
+            state = keccak_f(state)
+        else:
+            sub = state[active]
+            sub[:, :lanes] ^= words[active, j]
+            state[active] = keccak_f(sub)
+    out = state.astype("<u8").tobytes()
+    return [out[i * 200:i * 200 + bits // 8].hex() for i in range(len(messages))]
+
+
+def sha3_file(path, bits=256, chunk=1 << 16):
+    h = SHA3(bits)
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk)
+            if not data:
+                return h.hexdigest()
+            h.update(data)
+
+
+def trace_lanes(blocks, rate_lanes, rounds=3):
+    # Absorb P0 (shape (batch, rate_lanes) uint64) into a zero state and run
+    # the rounds. Returns a (rounds, 5, batch, 25) bool array: which lanes
+    # are nonzero after each step.
+    blocks = np.asarray(blocks, dtype=np.uint64)
+    state = np.zeros((len(blocks), 25), dtype=np.uint64)
+    state[:, :rate_lanes] = blocks
+    trace = []
+    keccak_f(state, rounds, trace)
+    return np.array(trace).reshape(rounds, len(STEPS), len(blocks), 25)
+
+
+def random_blocks(batch, rate_lanes, rng=None, nonzero=True):
+    # Random P0 blocks; with nonzero=True every lane has at least one set bit
+    rng = rng or np.random.default_rng()
+    blocks = rng.integers(0, 1 << 64, (batch, rate_lanes), dtype=np.uint64, endpoint=False)
+    if nonzero:
+        zero = blocks == 0
+        blocks[zero] = 1
+    return blocks
+
+
+def capacity_report(trace, rate_lanes):
+    # Per round and step: mean number of nonzero capacity lanes, and the
+    # fraction of blocks with every capacity lane nonzero
+    capacity = trace[..., rate_lanes:]
+    counts = capacity.sum(axis=-1)
+    full = capacity.all(axis=-1)
+    return counts.mean(axis=-1), full.mean(axis=-1)
+
+
+def benchmark(size=1 << 20, batch=10_000):
+    print("=== Keccak benchmark ===")
+    data = os.urandom(size)
+    start = time.perf_counter()
+    digest = SHA3(256, data).hexdigest()
+    elapsed = time.perf_counter() - start
+    assert digest == hashlib.sha3_256(data).hexdigest()
+    print(f"SHA3-256 streaming:   {size / elapsed / 1e6:8.2f} MB/s")
+
+    messages = [os.urandom(4096) for _ in range(1000)]
+    start = time.perf_counter()
+    digests = sha3_many(messages)
+    elapsed = time.perf_counter() - start
+    assert digests[0] == hashlib.sha3_256(messages[0]).hexdigest()
+    print(f"SHA3-256 batch of {len(messages)}: {4096 * len(messages) / elapsed / 1e6:8.2f} MB/s")
+
+    states = random_blocks(batch, 25)
+    start = time.perf_counter()
+    keccak_f(states)
+    elapsed = time.perf_counter() - start
+    print(f"Batched Keccak-f:     {batch / elapsed:8.0f} permutations/s ({batch} states)")
+
+    start = time.perf_counter()
+    trace_lanes(random_blocks(batch, 16), 16)
+    print(f"Tracer, 3 rounds:     {batch / (time.perf_counter() - start):8.0f} blocks/s")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,109 @@
+# Monoalphabetic substitution solver (Programs 16, 37, 40)
+# Key-swap hill climbing with random restarts, scored with quadgram
+# log-probabilities. A swap of two key letters only touches the quadgrams
+# that cover those two cipher letters, so only those are re-scored.
+import multiprocessing
+import random
+import time
+
+import numpy as np
+
+from classical import mono_table, text_to_nums, translate
+from ngrams import QUAD_WEIGHTS, quadgrams
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+class SwapScorer:
+    # Holds the ciphertext quadgrams and, for every pair of cipher letters,
+    # the quadgram positions a swap of those two letters can change
+    def __init__(self, cipher_nums, table):
+        self.table = table
+        self.quads = np.lib.stride_tricks.sliding_window_view(cipher_nums, 4)
+        touching = [np.flatnonzero((self.quads == c).any(axis=1)) for c in range(26)]
+        self.affected = {}
+        for a in range(26):
+            for b in range(a + 1, 26):
+                self.affected[a, b] = np.union1d(touching[a], touching[b])
+
+    def start(self, key):
+        # key[c] = plaintext letter for cipher letter c
+        self.index = key[self.quads] @ QUAD_WEIGHTS
+        return float(self.table[self.index].sum())
+
+    def try_swap(self, key, a, b):
+        # Returns (delta, positions, new indices) for swapping key[a], key[b]
+        pos = self.affected[a, b]
+        key[a], key[b] = key[b], key[a]
+        new = key[self.quads[pos]] @ QUAD_WEIGHTS
+        key[a], key[b] = key[b], key[a]
+        delta = float(self.table[new].sum() - self.table[self.index[pos]].sum())
+        return delta, pos, new
+
+    def apply(self, key, a, b, pos, new):
+        key[a], key[b] = key[b], key[a]
+        self.index[pos] = new
+
+
+def climb(scorer, key, rng, patience=1000):
+    score = scorer.start(key)
+    pairs = list(scorer.affected)
+    stale = 0
+    while stale < patience:
+        a, b = pairs[rng.randrange(len(pairs))]
+        delta, pos, new = scorer.try_swap(key, a, b)
+        if delta > 0:
+            scorer.apply(key, a, b, pos, new)
+            score += delta
+            stale = 0
+        else:
+            stale += 1
+    return score
+
+
+def search(cipher_nums, time_budget, seed):
+    # Restarts alternate between fresh random keys and a few random swaps
+    # away from the best key so far, which escapes local maxima far more
+    # often than random restarts alone
+    rng = random.Random(seed)
+    scorer = SwapScorer(cipher_nums, quadgrams())
+    deadline = time.perf_counter() + time_budget
+    best_key, best_score, restarts = None, float("-inf"), 0
+    while restarts == 0 or time.perf_counter() < deadline:
+        if best_key is None or restarts % 2:
+            key = np.array(rng.sample(range(26), 26))
+        else:
+            key = best_key.copy()
+            for _ in range(rng.randint(2, 6)):
+                a, b = rng.sample(range(26), 2)
+                key[a], key[b] = key[b], key[a]
+        score = climb(scorer, key, rng)
+        restarts += 1
+        if score > best_score:
+            best_key, best_score = key.copy(), score
+    return best_score, best_key, restarts
+
+
+def _search_worker(args):
+    return search(*args)
+
+
+def solve_mono(ciphertext, time_budget=5.0, workers=1, seed=None):
+    # Returns (encryption key in Program 2 format, score, restarts)
+    cipher_nums = text_to_nums(ciphertext)
+    if len(cipher_nums) < 4:
+        raise ValueError("Ciphertext too short")
+    seeds = [None if seed is None else seed + i for i in range(workers)]
+    if workers == 1:
+        results = [search(cipher_nums, time_budget, seeds[0])]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(_search_worker,
+                               [(cipher_nums, time_budget, s) for s in seeds])
+    score, decrypt_key, _ = max(results, key=lambda r: r[0])
+    encrypt_key = "".join(ALPHABET[c] for c in np.argsort(decrypt_key))
+    return encrypt_key, score, sum(r[2] for r in results)
+
+
+def decrypt(ciphertext, key):
+    return translate(ciphertext, mono_table(key, decrypt=True))
@@ -0,0 +1,275 @@
+# Shared English letter statistics for the frequency attacks
+# The n-gram language model (unigram to quadgram log10 probabilities from a
+# plain-text corpus) is built once and stored as one packed binary file: a
+# 64-byte header, then float32 tables of 26, 26^2, 26^3 and 26^4 entries.
+# Loading it is an mmap, so every solver process shares the same read-only
+# pages instead of re-reading and counting the corpus at startup. The header
+# records which corpus the file came from, with its size and mtime, and a
+# stale file is rebuilt. When the cache cannot be written the tables are
+# built in memory instead.
+import hashlib
+import os
+import struct
+import time
+
+import numpy as np
+
+from classical import text_to_nums
+
+# Relative frequency of A-Z in English text
+ENGLISH_FREQ = np.array([
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015,
+    0.06094, 0.06966, 0.00153, 0.00772, 0.04025, 0.02406, 0.06749,
+    0.07507, 0.01929, 0.00095, 0.05987, 0.06327, 0.09056, 0.02758,
+    0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+])
+ENGLISH_IC = float((ENGLISH_FREQ ** 2).sum())
+RANDOM_IC = 1 / 26
+
+# SHIFT_INDEX[s, x] = (x + s) % 26: rotating a ciphertext histogram by s
+SHIFT_INDEX = (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26
+
+
+def letter_counts(nums):
+    return np.bincount(nums, minlength=26)
+
+
+def index_of_coincidence(counts):
+    # counts has shape (..., 26); returns one IC per histogram
+    counts = np.asarray(counts, dtype=np.float64)
+    n = counts.sum(axis=-1)
+    pairs = (counts * (counts - 1)).sum(axis=-1)
+    return np.divide(pairs, n * (n - 1), out=np.zeros_like(n), where=n > 1)
+
+
+def chi_squared_shifts(counts):
+    # Score every additive shift s of a ciphertext histogram at once:
+    # plaintext letter x was seen counts[(x + s) % 26] times.
+    # counts has shape (..., 26); returns chi-squared of shape (..., 26).
+    counts = np.asarray(counts, dtype=np.float64)
+    expected = counts.sum(axis=-1, keepdims=True)[..., None] * ENGLISH_FREQ
+    observed = counts[..., SHIFT_INDEX]
+    expected = np.where(expected > 0, expected, 1)
+    return ((observed - expected) ** 2 / expected).sum(axis=-1)
+
+
+# Set CRYPTOLAB_CORPUS to point at a larger corpus for better statistics,
+# CRYPTOLAB_LM to keep the packed model at a fixed path
+CORPUS_PATH = os.environ.get(
+    "CRYPTOLAB_CORPUS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "english_corpus.txt"))
+CACHE_DIR = os.environ.get(
+    "CRYPTOLAB_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "cryptolab"),
+)
+MAX_N = 4
+QUAD_WEIGHTS = np.array([26 ** 3, 26 ** 2, 26, 1])
+MAGIC = b"CLNGRAM2"
+# magic, corpus bytes, corpus mtime_ns, letters, corpus id (hash of its path)
+HEADER = struct.Struct("<8sQqQ16s")
+HEADER_BYTES = 64
+SIZES = [26 ** n for n in range(1, MAX_N + 1)]
+OFFSETS = np.cumsum([0] + SIZES)
+_model = None
+
+
+def _corpus_id(corpus):
+    return hashlib.sha256(os.path.abspath(corpus).encode()).digest()[:16]
+
+
+def model_path(corpus=None):
+    # CRYPTOLAB_LM only names the model of the configured corpus; any other
+    # corpus gets its own file in the cache directory
+    corpus = corpus or CORPUS_PATH
+    if os.environ.get("CRYPTOLAB_LM") and os.path.abspath(corpus) == os.path.abspath(CORPUS_PATH):
+        return os.environ["CRYPTOLAB_LM"]
+    return os.path.join(CACHE_DIR, f"ngrams-{_corpus_id(corpus).hex()}.bin")
+
+
+def ngram_indices(nums, n):
+    # Rolling base-26 index of every n-gram in a letter array
+    nums = np.asarray(nums, dtype=np.int32)
+    if len(nums) < n:
+        return np.empty(0, dtype=np.int32)
+    index = nums[:len(nums) - n + 1].copy()
+    for i in range(1, n):
+        index *= 26
+        index += nums[i:len(nums) - n + 1 + i]
+    return index
+
+
+def quadgram_indices(nums):
+    return ngram_indices(nums, 4)
+
+
+def _log_probs(counts):
+    total = counts.sum()
+    # Unseen n-grams get a floor well below the rarest observed one
+    floor = np.log10(0.01 / total)
+    with np.errstate(divide="ignore"):
+        table = np.log10(counts / total)
+    table[counts == 0] = floor
+    return table.astype(np.float32)
+
+
+def build_ngrams(nums, n):
+    return _log_probs(np.bincount(ngram_indices(nums, n), minlength=26 ** n))
+
+
+def build_bigrams(nums):
+    return build_ngrams(nums, 2).reshape(26, 26)
+
+
+def build_quadgrams(nums):
+    return build_ngrams(nums, 4)
+
+
+def corpus_nums(corpus=None):
+    with open(corpus or CORPUS_PATH, "rb") as f:
+        return text_to_nums(f.read())
+
+
+def _corpus_stamp(corpus):
+    st = os.stat(corpus)
+    return st.st_size, st.st_mtime_ns
+
+
+def _pack_tables(nums):
+    return np.concatenate([build_ngrams(nums, n) for n in range(1, MAX_N + 1)]).astype("<f4")
+
+
+def write_model(path, corpus=None):
+    # Count the corpus once and write every table to the packed file
+    corpus = corpus or CORPUS_PATH
+    size, mtime = _corpus_stamp(corpus)
+    nums = corpus_nums(corpus)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, size, mtime, len(nums), _corpus_id(corpus)).ljust(HEADER_BYTES, b"\0"))
+            f.write(_pack_tables(nums).tobytes())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+class NgramModel:
+    # data holds every table back to back; table(n) has 26^n entries.
+    # path is the mapped file, or None for a model built in memory.
+    def __init__(self, data, letters, corpus_bytes, corpus_mtime, corpus_id, path=None):
+        self.data = data
+        self.letters = letters
+        self.corpus_bytes, self.corpus_mtime, self.corpus_id = corpus_bytes, corpus_mtime, corpus_id
+        self.path = path
+
+    def table(self, n):
+        return self.data[OFFSETS[n - 1]:OFFSETS[n]]
+
+    def fitness(self, nums, n=MAX_N):
+        # Sum of n-gram log10 probabilities: one rolling-index gather
+        return float(self.table(n)[ngram_indices(nums, n)].sum(dtype=np.float64))
+
+    def stream_fitness(self, chunks, n=MAX_N):
+        # Score text arriving in chunks (str or bytes); the last n - 1
+        # letters carry over so n-grams across chunk boundaries count.
+        # Returns (total log10 probability, number of n-grams).
+        table = self.table(n)
+        carry = np.empty(0, dtype=np.uint8)
+        total, count = 0.0, 0
+        for chunk in chunks:
+            nums = np.concatenate([carry, text_to_nums(chunk)])
+            index = ngram_indices(nums, n)
+            total += float(table[index].sum(dtype=np.float64))
+            count += len(index)
+            carry = nums[max(0, len(nums) - n + 1):]
+        return total, count
+
+
+def map_model(path):
+    # Read-only views into the packed file
+    with open(path, "rb") as f:
+        magic, size, mtime, letters, corpus_id = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not an n-gram model file")
+    data = np.memmap(path, dtype="<f4", mode="r", offset=HEADER_BYTES, shape=(OFFSETS[-1],))
+    return NgramModel(data, letters, size, mtime, corpus_id, path)
+
+
+def build_model(corpus=None):
+    # The same tables built in memory, with nothing written to disk
+    corpus = corpus or CORPUS_PATH
+    nums = corpus_nums(corpus)
+    return NgramModel(_pack_tables(nums), len(nums), *_corpus_stamp(corpus), _corpus_id(corpus))
+
+
+def load_model(corpus=None):
+    # The packed model for the corpus, built on first use or when stale. If
+    # the cache directory cannot be written the model is built in memory.
+    corpus = corpus or CORPUS_PATH
+    path = model_path(corpus)
+    stamp = (*_corpus_stamp(corpus), _corpus_id(corpus))
+    try:
+        model = map_model(path)
+        if (model.corpus_bytes, model.corpus_mtime, model.corpus_id) == stamp:
+            return model
+    except (OSError, ValueError, struct.error):
+        pass
+    try:
+        write_model(path, corpus)
+        return map_model(path)
+    except OSError:
+        return build_model(corpus)
+
+
+def model():
+    global _model
+    if _model is None:
+        _model = load_model()
+    return _model
+
+
+def bigrams():
+    # (26, 26) table: bigrams()[x, y] = log10 P(xy)
+    return model().table(2).reshape(26, 26)
+
+
+def quadgrams():
+    return model().table(4)
+
+
+def fitness(nums, n=MAX_N):
+    return model().fitness(nums, n)
+
+
+def quadgram_score(nums, table=None):
+    if table is None:
+        return fitness(nums, 4)
+    return float(table[quadgram_indices(nums)].sum())
+
+
+def letter_order():
+    # A-Z from most to least frequent in the corpus
+    return "".join(chr(65 + i) for i in np.argsort(-model().table(1), kind="stable"))
+
+
+def benchmark(size=10_000_000):
+    print("=== N-gram model benchmark ===")
+    path = model_path()
+    start = time.perf_counter()
+    write_model(path)
+    print(f"Build from corpus: {(time.perf_counter() - start) * 1e3:8.1f} ms")
+    start = time.perf_counter()
+    lm = map_model(path)
+    print(f"Map packed file:   {(time.perf_counter() - start) * 1e3:8.3f} ms "
+          f"({os.path.getsize(path) / 1e6:.1f} MB, {lm.letters} corpus letters)")
+    nums = np.random.default_rng(1).integers(0, 26, size, dtype=np.uint8)
+    for n in range(1, MAX_N + 1):
+        start = time.perf_counter()
+        lm.fitness(nums, n)
+        print(f"{n}-gram fitness:    {size / (time.perf_counter() - start) / 1e6:8.1f} M letters/s")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,180 @@
+# Key-reuse attacks on the mod-26 one-time pad (Programs 14, 35)
+# When one key stream encrypts many messages, c_i - c_j = p_i - p_j at every
+# position: the key cancels. The ciphertexts are stacked into one
+# (messages, length) array. Crib dragging guesses a word in one message at
+# every offset at once: the guess fixes the key there, which decrypts the
+# same window of every other message. Each offset is scored by the mean
+# bigram log-probability of those fragments, so real hits stand out. With
+# many messages each key position is also a column of letters all shifted by
+# the same amount, which is solved like a Caesar cipher from its histogram.
+# Recovered key positions accumulate in a key stream with -1 for unknown.
+# Every character of a message uses up one key position, letter or not, so
+# messages are lined up by character position with non-letters masked out.
+import time
+
+import numpy as np
+
+from classical import nums_to_text, text_to_nums
+from ngrams import ENGLISH_FREQ, SHIFT_INDEX, bigrams, corpus_nums
+
+UNKNOWN = -1
+DRAG_CHUNK = 1 << 24            # elements of (messages, offsets, crib) per step
+
+
+def _code_points(text):
+    # (code points, letter mask, letter values 0-25) for every character
+    cp = np.frombuffer(text.encode("utf-32-le"), dtype="<u4").astype(np.int64)
+    upper = cp & ~0x20
+    mask = (upper >= 65) & (upper <= 90) & (cp < 128)
+    return cp, mask, np.where(mask, upper - 65, 0)
+
+
+def otp_text(text, key_stream, sign=1):
+    # Letter i of the text (either case) shifted by sign * key_stream[i];
+    # other characters, including non-ASCII ones, are kept and also consume
+    # a key position
+    cp, mask, nums = _code_points(text)
+    key = np.asarray(key_stream[:len(cp)], dtype=np.int64)
+    if len(key) < len(cp):
+        raise ValueError("Key stream too short")
+    base = cp - nums            # 'A' or 'a' for letters
+    out = np.where(mask, base + (nums + sign * key) % 26, cp)
+    return out.astype("<u4").tobytes().decode("utf-32-le")
+
+
+def key_for(ciphertext, plaintext):
+    # The key stream that turns plaintext into ciphertext (or a chosen
+    # "decryption" of it: any plaintext of the same length is possible)
+    return ((text_to_nums(ciphertext).astype(np.int64) - text_to_nums(plaintext)) % 26).tolist()
+
+
+class CribDragger:
+    def __init__(self, ciphertexts):
+        self.texts = list(ciphertexts)
+        self.lengths = np.array([len(t) for t in self.texts])
+        width = int(self.lengths.max())
+        self.cipher = np.zeros((len(self.texts), width), dtype=np.uint8)
+        self.valid = np.zeros((len(self.texts), width), dtype=bool)
+        for i, text in enumerate(self.texts):
+            _, mask, nums = _code_points(text)
+            self.cipher[i, :len(nums)] = nums
+            self.valid[i, :len(nums)] = mask
+        self.key = np.full(width, UNKNOWN, dtype=np.int16)
+
+    def difference(self, i, j):
+        # p_i - p_j over the overlap of messages i and j; UNKNOWN where
+        # either message has a non-letter
+        n = min(self.lengths[i], self.lengths[j])
+        diff = (self.cipher[i, :n].astype(np.int16) - self.cipher[j, :n]) % 26
+        return np.where(self.valid[i, :n] & self.valid[j, :n], diff, UNKNOWN)
+
+    def drag(self, crib, source=0, top=10):
+        # Slide the crib over every offset of message `source` where it
+        # covers only letters; returns [(offset, score), ...] best first.
+        # Score is the mean bigram log10 probability of the fragments it
+        # implies in the other messages.
+        crib = text_to_nums(crib).astype(np.int16)
+        w = len(crib)
+        if w < 2:
+            raise ValueError("Crib needs at least two letters")
+        offsets = int(self.lengths[source]) - w + 1
+        if offsets <= 0:
+            return []
+        table = bigrams()
+        others = np.flatnonzero(np.arange(len(self.cipher)) != source)
+        windows = np.lib.stride_tricks.sliding_window_view(self.cipher, w, axis=1)
+        covered = np.lib.stride_tricks.sliding_window_view(self.valid, w, axis=1).all(axis=2)
+        scores = np.full(offsets, -np.inf)
+        step = max(1, DRAG_CHUNK // (max(1, len(others)) * w))
+        for start in range(0, offsets, step):
+            stop = min(start + step, offsets)
+            key = (windows[source, start:stop] - crib) % 26                 # (t, w)
+            plain = (windows[others, start:stop] - key) % 26                # (m, t, w)
+            s = table[plain[..., :-1], plain[..., 1:]].sum(axis=2)          # (m, t)
+            v = covered[others, start:stop]
+            n = v.sum(axis=0)
+            ok = (n > 0) & covered[source, start:stop]
+            scores[start:stop] = np.where(ok, (s * v).sum(axis=0) / np.maximum(n, 1) / (w - 1), -np.inf)
+        best = np.argsort(-scores, kind="stable")[:top]
+        return [(int(t), float(scores[t])) for t in best if np.isfinite(scores[t])]
+
+    def _crib_key(self, crib, offset, source):
+        crib = text_to_nums(crib).astype(np.int16)
+        end = offset + len(crib)
+        if end > self.lengths[source] or not self.valid[source, offset:end].all():
+            raise ValueError(f"Message {source} has no run of {len(crib)} letters at offset {offset}")
+        return (self.cipher[source, offset:end] - crib) % 26
+
+    def _render(self, i, start, end, key):
+        # Message i decrypted over [start, end) with `key`; non-letters are
+        # shown as they are and letters under an unknown key as "_"
+        letters = nums_to_text((self.cipher[i, start:end].astype(np.int16) - key) % 26)
+        return "".join(ch if not ok else ("_" if k == UNKNOWN else p)
+                       for ch, ok, k, p in zip(self.texts[i][start:end], self.valid[i, start:end],
+                                               key.tolist(), letters))
+
+    def fragments(self, crib, offset, source=0):
+        # What the other messages read at `offset` if the crib is right
+        key = self._crib_key(crib, offset, source)
+        end = offset + len(key)
+        return {i: self._render(i, offset, end, key)
+                for i in range(len(self.cipher)) if i != source and self.lengths[i] >= end}
+
+    def accept(self, crib, offset, source=0):
+        # Fix the key stream under the crib
+        key = self._crib_key(crib, offset, source)
+        self.key[offset:offset + len(key)] = key
+
+    def guess_columns(self, min_depth=6, overwrite=False):
+        # Solve each key position whose column holds at least min_depth
+        # letters as a Caesar shift, by log-likelihood against English;
+        # returns how many positions were filled
+        depth = self.valid.sum(axis=0)
+        counts = np.zeros((self.cipher.shape[1], 26))
+        rows, cols = np.nonzero(self.valid)
+        np.add.at(counts, (cols, self.cipher[rows, cols]), 1)
+        shifts = (counts[:, SHIFT_INDEX] @ np.log(ENGLISH_FREQ)).argmax(axis=1)
+        target = depth >= min_depth
+        if not overwrite:
+            target &= self.key == UNKNOWN
+        self.key[target] = shifts[target]
+        return int(target.sum())
+
+    def plaintexts(self):
+        # Every message decrypted with the key recovered so far
+        return [self._render(i, 0, n, self.key[:n]) for i, n in enumerate(self.lengths)]
+
+
+def reused_pad(messages, length, rng=None):
+    # Test data: `messages` corpus excerpts under one random key stream
+    rng = rng or np.random.default_rng()
+    corpus = corpus_nums()
+    key = rng.integers(0, 26, length)
+    starts = rng.integers(0, len(corpus) - length, messages)
+    plains = [corpus[s:s + length] for s in starts]
+    return key, [nums_to_text((p + key) % 26) for p in plains], [nums_to_text(p) for p in plains]
+
+
+def benchmark(messages=300, length=20_000, seed=1):
+    rng = np.random.default_rng(seed)
+    key, ciphers, plains = reused_pad(messages, length, rng)
+    print(f"=== Crib dragging ({messages} messages x {length} letters, one key) ===")
+    start = time.perf_counter()
+    dragger = CribDragger(ciphers)
+    filled = dragger.guess_columns()
+    elapsed = time.perf_counter() - start
+    correct = (dragger.key == key).mean()
+    print(f"Column statistics: {filled} positions in {elapsed:.2f} s, {correct:.2%} of key correct")
+    source = 0
+    offset = int(rng.integers(0, length - 8))
+    crib = plains[source][offset:offset + 8]
+    start = time.perf_counter()
+    hits = dragger.drag(crib, source, top=3)
+    elapsed = time.perf_counter() - start
+    rank = [t for t, _ in hits].index(offset) + 1 if offset in [t for t, _ in hits] else None
+    print(f"Drag {crib!r}: {length * messages * len(crib) / elapsed / 1e6:.1f} M letter-trials/s, "
+          f"true offset ranked {rank}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,156 @@
+# Block cipher padding: ISO/IEC 7816-4 and PKCS#7 (Programs 21, 34)
+# ISO/IEC 7816-4 is the "1 bit followed by zero bits" scheme: a 0x80 byte,
+# then 0x00 bytes up to the block boundary. PKCS#7 fills with n bytes of
+# value n. Both always add padding, a whole block when the message is
+# already aligned. The streaming Padder/Unpadder keep only the trailing
+# partial (or last) block, so a stream of any size is padded without being
+# buffered. Unpadding checks every byte of the last block with the same
+# branch-free mask arithmetic whatever the padding looks like, and only
+# decides at the end, so timing does not reveal where a bad pad failed.
+import os
+import time
+
+SCHEMES = ("iso7816", "pkcs7")
+
+
+def _check_scheme(scheme, block_size):
+    if scheme not in SCHEMES:
+        raise ValueError(f"Unknown padding scheme: {scheme}")
+    if not 1 <= block_size <= 255:
+        raise ValueError("Block size must be between 1 and 255 bytes")
+
+
+def padding_for(length, block_size=8, scheme="pkcs7"):
+    _check_scheme(scheme, block_size)
+    n = block_size - length % block_size
+    if scheme == "pkcs7":
+        return bytes([n]) * n
+    return b"\x80" + bytes(n - 1)
+
+
+def pad(data, block_size=8, scheme="pkcs7"):
+    return bytes(data) + padding_for(len(data), block_size, scheme)
+
+
+# Branch-free comparisons on small non-negative ints; each returns 0 or 1
+def _eq(a, b):
+    return (((a ^ b) - 1) >> 8) & 1
+
+
+def _lt(a, b):
+    return ((a - b) >> 16) & 1
+
+
+def _pkcs7_length(block):
+    bs = len(block)
+    n = block[-1]
+    bad = _eq(n, 0) | _lt(bs, n)
+    for i, b in enumerate(block):
+        in_pad = 1 ^ _lt(i, bs - n)
+        bad |= in_pad & (1 ^ _eq(b, n))
+    return n, bad
+
+
+def _iso7816_length(block):
+    # Walk back from the end: zeros are padding until the 0x80 marker
+    found = length = bad = 0
+    for b in reversed(block):
+        searching = 1 ^ found
+        is_marker = _eq(b, 0x80)
+        bad |= searching & (1 ^ (is_marker | _eq(b, 0)))
+        length += searching
+        found |= searching & is_marker
+    return length, bad | (1 ^ found)
+
+
+def padding_length(block, scheme="pkcs7"):
+    # Length of the padding at the end of the final block; raises
+    # ValueError for invalid padding after checking the whole block
+    _check_scheme(scheme, len(block))
+    check = _pkcs7_length if scheme == "pkcs7" else _iso7816_length
+    length, bad = check(block)
+    if bad:
+        raise ValueError("Invalid padding")
+    return length
+
+
+def unpad(data, block_size=8, scheme="pkcs7"):
+    if not data or len(data) % block_size:
+        raise ValueError("Padded data must be a non-empty multiple of the block size")
+    return bytes(data[:len(data) - padding_length(data[-block_size:], scheme)])
+
+
+class Padder:
+    # update() returns every complete block so far; finalize() the padded tail
+    def __init__(self, block_size=8, scheme="pkcs7"):
+        _check_scheme(scheme, block_size)
+        self.block_size = block_size
+        self.scheme = scheme
+        self.buffer = b""
+
+    def update(self, data):
+        data = self.buffer + data if self.buffer else bytes(data)
+        cut = len(data) - len(data) % self.block_size
+        self.buffer = data[cut:]
+        return data[:cut]
+
+    def finalize(self):
+        tail, self.buffer = self.buffer, b""
+        return pad(tail, self.block_size, self.scheme)
+
+
+class Unpadder:
+    # Holds back the last whole block, which may be all padding, until
+    # finalize() strips it
+    def __init__(self, block_size=8, scheme="pkcs7"):
+        _check_scheme(scheme, block_size)
+        self.block_size = block_size
+        self.scheme = scheme
+        self.buffer = b""
+
+    def update(self, data):
+        data = self.buffer + data if self.buffer else bytes(data)
+        cut = max(0, (len(data) - 1) // self.block_size * self.block_size)
+        self.buffer = data[cut:]
+        return data[:cut]
+
+    def finalize(self):
+        tail, self.buffer = self.buffer, b""
+        if len(tail) != self.block_size:
+            raise ValueError("Padded data must be a non-empty multiple of the block size")
+        return unpad(tail, self.block_size, self.scheme)
+
+
+def stream(obj, chunks):
+    # Run a Padder or Unpadder over an iterable of chunks
+    for chunk in chunks:
+        out = obj.update(chunk)
+        if out:
+            yield out
+    yield obj.finalize()
+
+
+def benchmark(total=1 << 28, chunk=1 << 16, block_size=8):
+    print("=== Streaming padding benchmark ===")
+    data = os.urandom(chunk)
+    for scheme in SCHEMES:
+        # Odd-sized chunks so every update carries a partial block over
+        chunks = [data[:chunk - 3]] * (total // chunk)
+        start = time.perf_counter()
+        padded = sum(len(c) for c in stream(Padder(block_size, scheme), chunks))
+        pad_time = time.perf_counter() - start
+        chunks.append(padding_for(sum(map(len, chunks)), block_size, scheme))
+        start = time.perf_counter()
+        unpadded = sum(len(c) for c in stream(Unpadder(block_size, scheme), chunks))
+        unpad_time = time.perf_counter() - start
+        print(f"{scheme:<8} pad {padded / pad_time / 1e6:8.0f} MB/s   unpad {unpadded / unpad_time / 1e6:8.0f} MB/s")
+
+    block = pad(b"abc", block_size, "pkcs7")
+    start = time.perf_counter()
+    for _ in range(100_000):
+        padding_length(block)
+    print(f"Constant-time check: {(time.perf_counter() - start) * 10:.2f} us per block")
+
+
+if __name__ == "__main__":
+    benchmark()
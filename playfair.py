@@ -0,0 +1,82 @@
+# Shared engine: Playfair with a precomputed digraph table (Programs 3, 9, 10)
+# Each key square is turned into a letter -> (row, col) index once, and from
+# that into a 26x26 digraph -> digraph table for each direction. Whole
+# digraph arrays are then mapped through the table in one gather.
+import re
+
+import numpy as np
+
+from classical import nums_to_text, text_to_nums
+
+ALPHABET = "ABCDEFGHIKLMNOPQRSTUVWXYZ"
+I, J, X = 8, 9, 23
+# A letter, then optionally a different letter; doubles and a trailing
+# letter are padded with X
+DIGRAPH = re.compile(r"(.)(?:(?!\1)(.))?")
+ALL_FIRST, ALL_SECOND = np.divmod(np.arange(676), 26)
+
+
+def create_matrix(key):
+    key = "".join(c for c in key.upper().replace("J", "I") if c in ALPHABET)
+    key = "".join(dict.fromkeys(key))
+    return key + "".join(c for c in ALPHABET if c not in key)
+
+
+def square_of(matrix):
+    # Accept a 25-letter string or the 5x5 list-of-lists used by the programs
+    if isinstance(matrix, str):
+        return matrix
+    return "".join("".join(row) for row in matrix)
+
+
+def position_index(cells):
+    # row, col of every letter A-Z; J shares the cell of I
+    pos = np.zeros(26, dtype=np.int64)
+    pos[cells] = np.arange(25)
+    pos[J] = pos[I]
+    return pos // 5, pos % 5
+
+
+def map_digraphs(cells, a, b, decrypt=False):
+    # Apply the Playfair rules to arrays of digraphs (a[i], b[i]) under the
+    # key square given as 25 letter numbers
+    row, col = position_index(cells)
+    step = -1 if decrypt else 1
+    r1, r2, c1, c2 = row[a], row[b], col[a], col[b]
+    same_row = r1 == r2
+    same_col = (c1 == c2) & ~same_row
+    out1_r = np.where(same_col, (r1 + step) % 5, r1)
+    out2_r = np.where(same_col, (r2 + step) % 5, r2)
+    out1_c = np.where(same_row, (c1 + step) % 5, np.where(same_col, c1, c2))
+    out2_c = np.where(same_row, (c2 + step) % 5, np.where(same_col, c2, c1))
+    return np.stack([cells[out1_r * 5 + out1_c], cells[out2_r * 5 + out2_c]], axis=-1)
+
+
+def digraph_table(square, decrypt=False):
+    # table[a * 26 + b] = output digraph for the input digraph (a, b)
+    cells = text_to_nums(square_of(square))
+    return map_digraphs(cells, ALL_FIRST, ALL_SECOND, decrypt).astype(np.uint8)
+
+
+def prepare(plaintext):
+    # Program 3's digraph rules: J -> I, split doubled letters with X,
+    # pad an odd final letter with X
+    text = nums_to_text(text_to_nums(plaintext)).replace("J", "I")
+    return "".join(a + (b or "X") for a, b in DIGRAPH.findall(text))
+
+
+def apply_table(table, nums):
+    pairs = np.asarray(nums, dtype=np.int64).reshape(-1, 2)
+    return table[pairs[:, 0] * 26 + pairs[:, 1]].reshape(-1)
+
+
+def encrypt(plaintext, matrix):
+    nums = text_to_nums(prepare(plaintext))
+    return nums_to_text(apply_table(digraph_table(matrix), nums))
+
+
+def decrypt(ciphertext, matrix):
+    nums = text_to_nums(ciphertext.upper().replace("J", "I"))
+    if len(nums) % 2:
+        raise ValueError("Playfair ciphertext must have an even number of letters")
+    return nums_to_text(apply_table(digraph_table(matrix, decrypt=True), nums))
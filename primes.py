@@ -0,0 +1,55 @@
+# Shared number theory: primality testing and prime generation
+import math
+import random
+
+SMALL_PRIMES = [p for p in range(2, 1000) if all(p % d for d in range(2, math.isqrt(p) + 1))]
+# Deterministic Miller-Rabin witnesses for n < 3.3 * 10^24
+WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def is_probable_prime(n, rounds=0, rng=None):
+    # Miller-Rabin. Below 3.3e24 the fixed witness set makes it exact; above
+    # that, `rounds` extra random bases are tried (default 24, error < 4^-24)
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    bases = list(WITNESSES)
+    if n >= 3_317_044_064_679_887_385_961_981:
+        rng = rng or random.SystemRandom()
+        bases += [rng.randrange(2, n - 1) for _ in range(rounds or 24)]
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def next_prime(n):
+    # Smallest prime >= n
+    if n <= 2:
+        return 2
+    n |= 1
+    while not is_probable_prime(n):
+        n += 2
+    return n
+
+
+def random_prime(bits, rng=None):
+    # Uniform-ish prime of exactly `bits` bits
+    rng = rng or random.SystemRandom()
+    while True:
+        n = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if is_probable_prime(n):
+            return n
@@ -0,0 +1,167 @@
+# RSA key generation and CRT private-key operations (Programs 24, 26, 27)
+# Private operations use the Chinese Remainder Theorem: two half-size
+# exponentiations mod p and mod q with precomputed dp = d mod (p-1),
+# dq = d mod (q-1) and qinv = q^-1 mod p, recombined with Garner's formula.
+# Half-size moduli and exponents make this about 3-4x faster than
+# pow(c, d, n). encrypt/decrypt are textbook RSA; encrypt_oaep/decrypt_oaep
+# add RSAES-OAEP padding (RFC 8017, SHA-256 and MGF1).
+import hashlib
+import hmac
+import math
+import multiprocessing
+import os
+import random
+import time
+
+from primes import is_probable_prime
+
+
+def generate_prime(bits, e=65537, rng=None):
+    # Top two bits set so p * q has exactly 2 * bits bits; p - 1 coprime to e
+    rng = rng or random.SystemRandom()
+    while True:
+        p = rng.getrandbits(bits) | (3 << (bits - 2)) | 1
+        if math.gcd(p - 1, e) == 1 and is_probable_prime(p, rng=rng):
+            return p
+
+
+class RSAKey:
+    def __init__(self, p, q, e=65537):
+        if p == q:
+            raise ValueError("p and q must be distinct")
+        self.p, self.q = max(p, q), min(p, q)
+        self.n = p * q
+        self.e = e
+        self.phi = (p - 1) * (q - 1)
+        self.d = pow(e, -1, self.phi)
+        self.dp = self.d % (self.p - 1)
+        self.dq = self.d % (self.q - 1)
+        self.qinv = pow(self.q, -1, self.p)
+
+    @property
+    def bits(self):
+        return self.n.bit_length()
+
+    def encrypt(self, m):
+        return pow(m, self.e, self.n)
+
+    def decrypt(self, c):
+        # CRT: m = mq + q * ((mp - mq) * qinv mod p)
+        mp = pow(c, self.dp, self.p)
+        mq = pow(c, self.dq, self.q)
+        return mq + self.q * ((mp - mq) * self.qinv % self.p)
+
+    def decrypt_plain(self, c):
+        return pow(c, self.d, self.n)
+
+    def sign(self, m):
+        return self.decrypt(m)
+
+    def verify(self, m, s):
+        return self.encrypt(s) == m % self.n
+
+    def decrypt_many(self, values, workers=1):
+        # Batch mode: many ciphertexts (or messages to sign) under one key
+        values = list(values)
+        if workers == 1:
+            return [self.decrypt(c) for c in values]
+        with multiprocessing.Pool(workers) as pool:
+            return pool.map(self.decrypt, values, chunksize=max(1, len(values) // (4 * workers)))
+
+    sign_many = decrypt_many
+
+    def encrypt_oaep(self, message, label=b""):
+        k = (self.bits + 7) // 8
+        return self.encrypt(int.from_bytes(oaep_encode(message, k, label), "big"))
+
+    def decrypt_oaep(self, c, label=b""):
+        k = (self.bits + 7) // 8
+        return oaep_decode(self.decrypt(c).to_bytes(k, "big"), label)
+
+
+def mgf1(seed, length):
+    out = b"".join(hashlib.sha256(seed + i.to_bytes(4, "big")).digest()
+                   for i in range(-(-length // 32)))
+    return out[:length]
+
+
+def _xor(a, b):
+    return bytes(x ^ y for x, y in zip(a, b))
+
+
+def oaep_encode(message, k, label=b""):
+    # EM = 0x00 || maskedSeed || maskedDB, with a fresh random seed each time
+    h = 32
+    if len(message) > k - 2 * h - 2:
+        raise ValueError("Message too long for OAEP with this key")
+    db = hashlib.sha256(label).digest() + bytes(k - len(message) - 2 * h - 2) + b"\x01" + message
+    seed = os.urandom(h)
+    masked_db = _xor(db, mgf1(seed, k - h - 1))
+    return b"\x00" + _xor(seed, mgf1(masked_db, h)) + masked_db
+
+
+def oaep_decode(em, label=b""):
+    h = 32
+    masked_seed, masked_db = em[1:h + 1], em[h + 1:]
+    db = _xor(masked_db, mgf1(_xor(masked_seed, mgf1(masked_db, h)), len(masked_db)))
+    rest = db[h:].lstrip(b"\x00")
+    if em[0] != 0 or not hmac.compare_digest(db[:h], hashlib.sha256(label).digest()) or rest[:1] != b"\x01":
+        raise ValueError("Decryption error")
+    return rest[1:]
+
+
+def generate_key(bits=2048, e=65537, rng=None):
+    half = bits // 2
+    p = generate_prime(bits - half, e, rng)
+    q = p
+    while q == p:
+        q = generate_prime(half, e, rng)
+    return RSAKey(p, q, e)
+
+
+def factor_from_private(n, e, d, rng=None):
+    # Factor n given any valid private exponent: e*d - 1 = 2^s * t is a
+    # multiple of the order of every unit, so some a^(2^i * t) is a
+    # nontrivial square root of 1, and gcd(root - 1, n) is a factor
+    rng = rng or random.Random()
+    k = e * d - 1
+    t = k
+    while t % 2 == 0:
+        t //= 2
+    while True:
+        a = rng.randrange(2, n - 1)
+        g = math.gcd(a, n)
+        if g > 1:
+            return g, n // g
+        x = pow(a, t, n)
+        while x != 1:
+            y = x * x % n
+            if y == 1:
+                if x != n - 1:
+                    p = math.gcd(x - 1, n)
+                    return p, n // p
+                break
+            x = y
+
+
+def benchmark(sizes=(1024, 2048, 3072, 4096), ops=20, seed=1):
+    rng = random.Random(seed)
+    print("=== RSA private-key benchmark ===")
+    print(f"{'bits':>5} {'keygen s':>9} {'pow ms':>8} {'CRT ms':>8} {'speedup':>8}")
+    for bits in sizes:
+        start = time.perf_counter()
+        key = generate_key(bits, rng=rng)
+        keygen = time.perf_counter() - start
+        cs = [rng.randrange(2, key.n) for _ in range(ops)]
+        start = time.perf_counter()
+        plain = [key.decrypt_plain(c) for c in cs]
+        slow = (time.perf_counter() - start) / ops
+        start = time.perf_counter()
+        fast = key.decrypt_many(cs)
+        crt = (time.perf_counter() - start) / ops
+        assert fast == plain
+        print(f"{bits:5d} {keygen:9.2f} {slow * 1e3:8.2f} {crt * 1e3:8.2f} {slow / crt:7.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,128 @@
+# Dictionary attack on per-character textbook RSA (Program 27)
+# Textbook RSA is deterministic, so when each character is encrypted on its
+# own an attacker encrypts the whole alphabet under the public key once and
+# inverts ciphertexts by hash lookup. The table only depends on (e, n) and
+# the alphabet, so it is written to a cache file named by a hash of those
+# and reused by later runs. Ciphertext files are decrypted in one streaming
+# pass. With OAEP every encryption carries a fresh random seed, the same
+# character never repeats a ciphertext, and every lookup misses.
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from rsa import generate_key
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# Set CRYPTOLAB_CACHE to keep cached tables somewhere else
+CACHE_DIR = os.environ.get(
+    "CRYPTOLAB_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "cryptolab"),
+)
+
+
+def table_path(e, n, alphabet=ALPHABET, cache_dir=None):
+    key = hashlib.sha256(f"{e}:{n}:{alphabet}".encode()).hexdigest()[:32]
+    return os.path.join(cache_dir or CACHE_DIR, f"rsa-table-{key}.json")
+
+
+def build_table(e, n, alphabet=ALPHABET):
+    # Character i of the alphabet is sent as the number i (A-Z = 0-25)
+    return {pow(i, e, n): ch for i, ch in enumerate(alphabet)}
+
+
+def load_table(e, n, alphabet=ALPHABET, cache_dir=None):
+    # Returns (table, cached): the table from disk if present, otherwise a
+    # freshly built one that is saved for next time
+    path = table_path(e, n, alphabet, cache_dir)
+    try:
+        with open(path) as f:
+            saved = json.load(f)
+        if saved["e"] == e and int(saved["n"], 16) == n and saved["alphabet"] == alphabet:
+            return {int(c, 16): ch for c, ch in saved["table"].items()}, True
+    except (OSError, ValueError, KeyError):
+        pass
+    table = build_table(e, n, alphabet)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"e": e, "n": hex(n), "alphabet": alphabet,
+                   "table": {hex(c): ch for c, ch in table.items()}}, f)
+    os.replace(tmp, path)
+    return table, False
+
+
+def encrypt_text(text, e, n, alphabet=ALPHABET):
+    index = {ch: i for i, ch in enumerate(alphabet)}
+    return [pow(index[ch], e, n) for ch in text if ch in index]
+
+
+def write_ciphertexts(path, values):
+    # One ciphertext per line, hex
+    with open(path, "w") as f:
+        for c in values:
+            f.write(f"{c:x}\n")
+
+
+def decrypt_stream(lines, table, unknown="?"):
+    # Whitespace-separated hex ciphertexts, any number per line; returns
+    # (plaintext, number of ciphertexts not in the table)
+    out, misses = [], 0
+    for line in lines:
+        for token in line.split():
+            ch = table.get(int(token, 16))
+            if ch is None:
+                misses += 1
+                ch = unknown
+            out.append(ch)
+    return "".join(out), misses
+
+
+def decrypt_file(path, table, unknown="?"):
+    with open(path) as f:
+        return decrypt_stream(f, table, unknown)
+
+
+def encrypt_text_oaep(text, key):
+    # Same per-character scheme, but each character goes through OAEP
+    return [key.encrypt_oaep(ch.encode()) for ch in text]
+
+
+def compare_padding(text, key, alphabet=ALPHABET, cache_dir=None):
+    # Run the lookup attack on the same message encrypted textbook and with
+    # OAEP; returns {scheme: (recovered text, misses, seconds)}
+    table, _ = load_table(key.e, key.n, alphabet, cache_dir)
+    results = {}
+    for scheme, values in (("textbook", encrypt_text(text, key.e, key.n, alphabet)),
+                           ("OAEP", encrypt_text_oaep(text, key))):
+        start = time.perf_counter()
+        recovered, misses = decrypt_stream((f"{c:x}" for c in values), table)
+        results[scheme] = (recovered, misses, time.perf_counter() - start)
+    return results
+
+
+def benchmark(chars=200_000, bits=2048, cache_dir=None):
+    print(f"=== RSA dictionary attack ({bits}-bit key, {chars} characters) ===")
+    key = generate_key(bits)
+    text = (ALPHABET * (chars // len(ALPHABET) + 1))[:chars]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = cache_dir or tmp
+        for label in ("cold", "warm"):
+            start = time.perf_counter()
+            table, cached = load_table(key.e, key.n, cache_dir=cache_dir)
+            print(f"Table ({label}, cached={cached}): {(time.perf_counter() - start) * 1e3:8.2f} ms")
+        path = os.path.join(tmp, "cipher.txt")
+        write_ciphertexts(path, encrypt_text(text, key.e, key.n))
+        start = time.perf_counter()
+        recovered, misses = decrypt_file(path, table)
+        elapsed = time.perf_counter() - start
+        assert recovered == text and misses == 0
+        print(f"Lookup decrypt: {chars / elapsed:10.0f} chars/s")
+        start = time.perf_counter()
+        key.decrypt_many(encrypt_text(text[:500], key.e, key.n))
+        print(f"CRT decrypt:    {500 / (time.perf_counter() - start):10.0f} chars/s (with the private key)")
+
+
+if __name__ == "__main__":
+    benchmark()
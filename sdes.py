@@ -0,0 +1,146 @@
+# Shared engine: Simplified DES (Programs 22, 23)
+# S-DES has 1024 keys and 256 blocks, so the whole cipher fits in two
+# 1024x256 byte tables (256 KB each). The round functions below are written
+# with plain shifts and masks so they run unchanged on NumPy arrays; the
+# tables are built once by pushing every (key, block) pair through them, and
+# after that every block operation, in any mode, is a single lookup.
+import numpy as np
+
+P10 = [3, 5, 2, 7, 4, 10, 1, 9, 8, 6]
+P8 = [6, 3, 7, 4, 8, 5, 10, 9]
+IP = [2, 6, 3, 1, 4, 8, 5, 7]
+IP_INV = [4, 1, 3, 5, 7, 2, 8, 6]
+EP = [4, 1, 2, 3, 2, 3, 4, 1]
+P4 = [2, 4, 3, 1]
+S0 = [[1, 0, 3, 2], [3, 2, 1, 0], [0, 2, 1, 3], [3, 1, 3, 2]]
+S1 = [[0, 1, 2, 3], [2, 0, 1, 3], [3, 0, 1, 0], [2, 1, 0, 3]]
+S0_FLAT = np.array(S0).reshape(-1)
+S1_FLAT = np.array(S1).reshape(-1)
+_tables = None
+
+
+def permute(value, table, in_bits):
+    # Bits are numbered 1..in_bits from the most significant end; value may
+    # be an int or an integer array
+    out = 0
+    for pos in table:
+        out = (out << 1) | ((value >> (in_bits - pos)) & 1)
+    return out
+
+
+def rotate5(half, n):
+    return ((half << n) | (half >> (5 - n))) & 0x1F
+
+
+def subkeys(key):
+    k = permute(key, P10, 10)
+    left, right = rotate5(k >> 5, 1), rotate5(k & 0x1F, 1)
+    k1 = permute((left << 5) | right, P8, 10)
+    left, right = rotate5(left, 2), rotate5(right, 2)
+    k2 = permute((left << 5) | right, P8, 10)
+    return k1, k2
+
+
+def sbox(box, nibble):
+    # Bits 1 and 4 pick the row, bits 2 and 3 the column
+    row = ((nibble >> 2) & 2) | (nibble & 1)
+    col = (nibble >> 1) & 3
+    return box[row * 4 + col]
+
+
+def f_k(block, subkey):
+    left, right = block >> 4, block & 0xF
+    x = permute(right, EP, 4) ^ subkey
+    s = (sbox(S0_FLAT, x >> 4) << 2) | sbox(S1_FLAT, x & 0xF)
+    return ((left ^ permute(s, P4, 4)) << 4) | right
+
+
+def swap(block):
+    return ((block & 0xF) << 4) | (block >> 4)
+
+
+def crypt(block, key, decrypt=False):
+    # Direct computation; IP^-1(fK2(SW(fK1(IP(block))))) for encryption
+    k1, k2 = subkeys(key)
+    if decrypt:
+        k1, k2 = k2, k1
+    block = f_k(permute(block, IP, 8), k1)
+    return permute(f_k(swap(block), k2), IP_INV, 8)
+
+
+def tables():
+    # (encrypt, decrypt): table[key, block] for all 1024 keys and 256 blocks
+    global _tables
+    if _tables is None:
+        keys = np.arange(1024)[:, None]
+        blocks = np.arange(256)[None, :]
+        enc = crypt(blocks, keys).astype(np.uint8)
+        dec = np.empty_like(enc)
+        dec[np.arange(1024)[:, None], enc] = blocks
+        _tables = enc, dec
+    return _tables
+
+
+def to_int(bits):
+    return int(bits.replace(" ", ""), 2)
+
+
+def to_blocks(bits):
+    # "0000000100100011" -> array([1, 35]) of 8-bit blocks
+    bits = bits.replace(" ", "")
+    if len(bits) % 8:
+        raise ValueError("Bit string length must be a multiple of 8")
+    return np.array([int(bits[i:i + 8], 2) for i in range(0, len(bits), 8)], dtype=np.uint8)
+
+
+def to_bits(blocks):
+    return " ".join(f"{b:08b}" for b in blocks)
+
+
+def encrypt_block(block, key):
+    return int(tables()[0][key, block])
+
+
+def decrypt_block(block, key):
+    return int(tables()[1][key, block])
+
+
+def cbc_encrypt(blocks, key, iv):
+    # Sequential by definition: each block depends on the previous ciphertext
+    enc = tables()[0][key]
+    out = np.empty(len(blocks), dtype=np.uint8)
+    prev = iv
+    for i, p in enumerate(blocks):
+        prev = out[i] = enc[p ^ prev]
+    return out
+
+
+def cbc_decrypt(blocks, key, iv):
+    # P_i = D(C_i) xor C_(i-1) has no chain, so it is one gather
+    blocks = np.asarray(blocks, dtype=np.uint8)
+    prev = np.r_[np.uint8(iv), blocks[:-1]].astype(np.uint8)
+    return tables()[1][key][blocks] ^ prev
+
+
+def ctr(blocks, key, counter=0):
+    # Encryption and decryption are the same: C_i = P_i xor E(K, counter + i)
+    blocks = np.asarray(blocks, dtype=np.uint8)
+    counters = (counter + np.arange(len(blocks))) % 256
+    return tables()[0][key][counters] ^ blocks
+
+
+class SDES:
+    # Block-cipher core interface shared with des.DES for the CTR layer
+    block_size = 1
+
+    def __init__(self, key):
+        self.key = key
+
+    def encrypt_block(self, block):
+        return encrypt_block(block, self.key)
+
+    def decrypt_block(self, block):
+        return decrypt_block(block, self.key)
+
+    def keystream(self, counter, blocks):
+        return tables()[0][self.key][(counter + np.arange(blocks)) % 256].tobytes()